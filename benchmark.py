@@ -0,0 +1,184 @@
+"""
+Benchmark the parse, filter and dispatch stages of link_opener.py.
+
+Synthetic link files are generated for every size, and every stage is timed in a fresh process
+so that the peak memory of each stage can be measured on its own.
+Links are "opened" in a recording browser controller instead of a real browser, so that the benchmark runs headless.
+
+Example:
+    python benchmark.py --sizes 1000 100000 1000000
+"""
+import argparse
+import concurrent.futures
+import json
+import multiprocessing
+import os
+import pathlib
+import random
+import sys
+import tempfile
+import time
+import webbrowser
+
+#Number of lines in the generated files if no sizes are given
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000]
+#Maximum number of links "opened" by the dispatch stage
+DISPATCH_LIMIT = 100000
+#Number of different domains in the generated files
+DOMAIN_COUNT = 2000
+#Words comments are made of
+COMMENT_WORDS = ["news", "video", "music", "recipe", "tutorial", "python", "review", "watch later", "work", "todo",
+                 "shopping", "travel", "docs", "reference", "funny", "read", "sports", "science", "archive", "old"]
+#Share of lines which are empty, have a comment and end with '--'
+EMPTY_LINE_RATE = 0.05
+COMMENT_RATE = 0.7
+IGNORED_RATE = 0.1
+
+
+class RecordingBrowser(webbrowser.BaseBrowser):
+    """Browser controller which only records the URLs it is asked to open."""
+    def __init__(self):
+        super().__init__("recording")
+        self.urls = []
+
+    def open(self, url, new=0, autoraise=True) -> bool:
+        self.urls.append(url)
+        return True
+
+
+def generate_domains(rng) -> list:
+    """Return the DOMAIN_COUNT host names the links of a generated file are on."""
+    return [f"{rng.choice(['www.', '', 'm.', 'blog.'])}site{n}.{rng.choice(['com', 'org', 'net', 'io'])}" for n in range(DOMAIN_COUNT)]
+
+
+def generate_link_file(target_file, line_count, seed=0):
+    """Write a text file with line_count lines of random links, comments, ignored links and empty lines."""
+    rng = random.Random(seed)
+    domains = generate_domains(rng)
+    with open(target_file, "w") as file:
+        lines = []
+        for n in range(line_count):
+            if rng.random() < EMPTY_LINE_RATE:
+                lines.append("\n")
+                continue
+            url = f"https://{rng.choice(domains)}/page/{rng.randrange(100000)}?id={n}"
+            if rng.random() < IGNORED_RATE:
+                url += "--"
+            if rng.random() < COMMENT_RATE:
+                separator = "\t" if rng.random() < 0.2 else " "
+                url += separator + " ".join(rng.sample(COMMENT_WORDS, rng.randint(1, 3)))
+            lines.append(url + "\n")
+            if len(lines) >= 10000:
+                file.writelines(lines)
+                lines.clear()
+        file.writelines(lines)
+
+
+def get_link_file(data_dir, line_count) -> str:
+    """Return the path to a generated file with line_count lines, generating it if it does not exist yet."""
+    target_file = os.path.join(data_dir, f"links_{line_count}.txt")
+    if not os.path.exists(target_file):
+        generate_link_file(target_file, line_count)
+    return target_file
+
+
+def get_peak_rss() -> float:
+    """Return the peak memory used by this process in megabytes."""
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    #ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def run_stage(stage, target_file, line_count, work_dir) -> dict:
+    """Run a single stage on a file and return how long it took, how many items it produced and the peak memory."""
+    #config.ini and index files of link_opener.py are created in work_dir
+    os.chdir(work_dir)
+    import link_opener
+    link_opener.link_cache.clear()
+    start = time.perf_counter()
+    match stage:
+        case "baseline":
+            #Memory used by the interpreter and link_opener.py before any stage runs
+            items = 0
+        case "read_file":
+            items = sum(1 for line in link_opener.read_file(target_file))
+        case "filter_by_phrase":
+            items = sum(1 for line in link_opener.filter_by_phrase(link_opener.read_file(target_file), "python"))
+        case "filter_by_keywords":
+            items = sum(1 for line in link_opener.filter_by_keywords(link_opener.read_file(target_file), COMMENT_WORDS[:5]))
+        case "filter_by_domain":
+            #One of the domains the generated files were made with, along with its subdomains
+            domain = generate_domains(random.Random(0))[1].removeprefix("www.")
+            items = sum(1 for line in link_opener.filter_by_domain(link_opener.read_file(target_file), domain))
+        case "filter_by_lines":
+            items = sum(1 for line in link_opener.filter_by_lines(link_opener.read_file(target_file), line_count // 2, line_count))
+        case "read_line_range":
+            #Builds the line offset index first, as it is when a file is range filtered for the first time
+            link_opener.load_line_index(target_file)
+            start = time.perf_counter()
+            end = line_count
+            items = sum(1 for line in link_opener.read_line_range(target_file, max(1, end - 100), end))
+        case "strip_dashes_from_links":
+            lines = link_opener.filter_empty_lines(link_opener.read_file(target_file))
+            items = sum(1 for line in link_opener.strip_dashes_from_links(lines))
+        case "collect_links":
+            #The whole pipeline run before the batch warning, with ignored links and duplicates removed
+            items = len(link_opener.collect_links(target_file, [("Phrase", "news")], ignore_dashes=True, dedupe=True))
+        case "dispatch":
+            link_list = link_opener.collect_links(target_file, [])[:DISPATCH_LIMIT]
+            browser = RecordingBrowser()
+            start = time.perf_counter()
+            link_opener.open_links_in_browser(link_list, browser, delay=0)
+            items = len(browser.urls)
+        case _:
+            raise ValueError(f"Unknown stage '{stage}'")
+    seconds = time.perf_counter() - start
+    return {"stage": stage, "lines": line_count, "items": items, "seconds": seconds, "peak_rss_mb": get_peak_rss()}
+
+
+STAGES = ["baseline", "read_file", "filter_by_phrase", "filter_by_keywords", "filter_by_domain", "filter_by_lines",
+          "read_line_range", "strip_dashes_from_links", "collect_links", "dispatch"]
+
+
+def run_benchmarks(sizes, stages, data_dir, work_dir):
+    """Run every stage on a generated file of every size, each in a new process, and yield the results."""
+    context = multiprocessing.get_context("spawn")
+    for line_count in sizes:
+        target_file = get_link_file(data_dir, line_count)
+        for stage in stages:
+            #A new process for every stage so that the peak memory of one stage does not hide another
+            with concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                result = executor.submit(run_stage, stage, target_file, line_count, work_dir).result()
+            yield result
+
+
+def format_result(result) -> str:
+    """Return a result as a row of the results table."""
+    #Dispatch is measured in links opened per second, all other stages in lines read per second
+    processed = result["items"] if result["stage"] == "dispatch" else result["lines"]
+    rate = processed / result["seconds"] if result["seconds"] > 0 and result["stage"] != "baseline" else 0
+    return (f"{result['lines']:>10} {result['stage']:<24} {result['items']:>10} {result['seconds']:>10.3f} "
+            f"{rate:>14,.0f} {result['peak_rss_mb']:>10.1f}")
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Benchmark the parse, filter and dispatch stages of link_opener.py.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help=f"number of lines in the generated files (default: {' '.join(map(str, DEFAULT_SIZES))})")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES, help="stages to run (default: all)")
+    parser.add_argument("--data-dir", help="directory to keep generated files in between runs (default: temporary directory)")
+    parser.add_argument("--json", action="store_true", help="print results as JSON lines instead of a table")
+    arguments = parser.parse_args(args)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        data_dir = arguments.data_dir or work_dir
+        pathlib.Path(data_dir).mkdir(parents=True, exist_ok=True)
+        if not arguments.json:
+            print(f"{'lines':>10} {'stage':<24} {'items':>10} {'seconds':>10} {'per second':>14} {'peak MB':>10}")
+        for result in run_benchmarks(arguments.sizes, arguments.stages, os.path.abspath(data_dir), work_dir):
+            print(json.dumps(result) if arguments.json else format_result(result), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,49 +1,207 @@
-import tkinter as tk
-from tkinter import BooleanVar, StringVar, filedialog, messagebox, Label, Frame, Button, Entry, Checkbutton, OptionMenu
-from tkinter.simpledialog import askstring
 import pathlib
 import os
 import webbrowser
 import time
+import itertools
+import io
+import json
+import re
+import sqlite3
+import locale
+import zlib
+import urllib.parse
+import sys
+import subprocess
+import argparse
+import atexit
+import math
+import hashlib
+import array
+import mmap
+import functools
+import threading
+import bisect
+import contextlib
+import glob
+import concurrent.futures
+import multiprocessing
 from configparser import ConfigParser
+from collections import OrderedDict, deque
 
 DESKTOP = pathlib.Path.home() / 'Desktop'
 ICON_FILE_NAME = "link_opener-icon.png"
+#Sidecar file storing line offsets, saved next to the text file it indexes
+LINE_INDEX_SUFFIX = ".lineidx"
+#Number of lines between every stored line offset
+LINE_INDEX_STEP = 1000
+#Sidecar database storing the lines every comment word appears on, saved next to the text file it indexes
+WORD_INDEX_SUFFIX = ".wordidx"
+#Query parameters only used for tracking, which are ignored when looking for duplicate links
+TRACKING_PARAMETERS = {"fbclid", "gclid", "dclid", "gbraid", "wbraid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid", "_ga", "ref_src"}
+#Database storing every opened link and unfinished batches, saved next to config.ini
+HISTORY_FILE = "history.db"
+#Milliseconds the GUI waits after the last change before writing config.ini
+CONFIG_WRITE_DELAY = 1000
+#Maximum number of formatted lines kept in memory by the link cache
+LINK_CACHE_MAX_LINES = 1000000
+#Total size in bytes of several selected files above which they are read in parallel by a process pool
+PARALLEL_READ_MIN_BYTES = 16 * 1024 * 1024
+#Number of compiled URL patterns of regex filters kept to be reused
+REGEX_CACHE_SIZE = 128
+#Number of bytes of a file searched for a regex filter at a time
+REGEX_CHUNK_SIZE = 16 * 1024 * 1024
+#Parts of a regex filter which can match differently in a raw line than in its URL (anchors, lookarounds, atomic groups)
+RAW_PATTERN_UNSAFE_TOKENS = ("$", "\\A", "\\Z", "\\z", "(?=", "(?!", "(?<=", "(?<!", "(?>", "++", "*+", "?+", "}+")
+#Inline flags at the start of a regex filter, which apply to the whole pattern
+GLOBAL_FLAGS_PATTERN = re.compile(r"\(\?[aiLmsux]+\)")
+#Leading bytes of the compressed file formats link files are read from, without decompressing them to disk
+COMPRESSION_MAGIC = {b"\x1f\x8b": "gzip", b"BZh": "bzip2", b"\xfd7zXZ\x00": "xz", b"\x28\xb5\x2f\xfd": "zstd"}
+#Files selected when a directory is selected as a source of links
+LINK_FILE_PATTERNS = ("*.txt", "*.txt.gz", "*.txt.bz2", "*.txt.xz", "*.txt.zst")
+#Scheme and host name of a URL with nothing else (user, port, escapes or whitespace) before its path
+LINK_HOST_PATTERN = re.compile(r"([a-z][a-z0-9+.-]*://)?([^/?#@:\[\]\\%\s]*)(?:[/?#]|$)")
+#Formats links can be exported in, chosen by the extension of the export file if not given
+EXPORT_FORMATS = {".txt": "txt", ".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+#Bytes per line and compression ratio a file's number of lines is estimated by, on the short side of typical link files
+ESTIMATED_LINE_SIZE = 32
+ESTIMATED_COMPRESSION_RATIO = 8
+#Number of exported links formatted and written to the export file at a time
+EXPORT_BATCH_SIZE = 10000
+#Size in bytes of the write buffer of the export file
+EXPORT_BUFFER_SIZE = 1024 * 1024
+#Request headers sent when checking if a link leads to a page
+LINK_CHECK_HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; link_opener link check)", "Accept": "*/*"}
+#Upper bounds in seconds of the browser launch latency histogram
+LAUNCH_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+#Milliseconds the GUI waits after the last key press before previewing the filter being typed
+PREVIEW_DELAY = 150
+#Number of matching links shown by the filter preview
+PREVIEW_MATCHES = 8
+#Number of lines the filter preview checks between looking for a newer query
+PREVIEW_CHUNK_SIZE = 20000
+
+#Formatted lines of previously read files, the least recently used entry is evicted first
+link_cache = OrderedDict()
+#Guards link_cache, which is also used by the filter preview thread
+link_cache_lock = threading.Lock()
                     
 #Stops [DEFAULT] in config.ini from being overwritten
 config = ConfigParser(default_section=None)
 #Checks if config.ini file exits in same directory       
 has_config = pathlib.Path("config.ini").exists()    
 
+#Settings changed since config.ini was last written, as (section, key) tuples
+changed_config_keys = set()
+#Called by write_config() to write config.ini later instead of right away, set by the GUI
+config_write_scheduler = None
+
+def set_config_value(section, key, value):
+    """Change a value in config and remember to write it to config.ini if it is different from before."""
+    value = str(value)
+    if not config.has_option(section, key) or config.get(section, key) != value:
+        config.set(section, key, value)
+        changed_config_keys.add((section, key))
+
 def write_config():
-    """Write changed values to config.ini."""
-    with open("config.ini", "w") as configfile:
+    """Write changed values to config.ini, or schedule them to be written if config_write_scheduler has been set."""
+    if config_write_scheduler is not None:
+        config_write_scheduler()
+    else:
+        flush_config()
+
+def flush_config():
+    """
+    Write config.ini if any values have changed since it was last written.
+
+    The new config is written to a temporary file which then replaces config.ini, 
+    so that config.ini is never left half written if the program stops while writing.
+    """
+    if len(changed_config_keys) == 0:
+        return
+    with open("config.ini.tmp", "w") as configfile:
         config.write(configfile)
+        configfile.flush()
+        os.fsync(configfile.fileno())
+    os.replace("config.ini.tmp", "config.ini")
+    changed_config_keys.clear()
+
+#Writes any changes still waiting when the program exits
+atexit.register(flush_config)
+
+#Default value of every setting stored under [DEFAULT] and [USERCONFIG] in config.ini
+DEFAULT_SETTINGS = {
+    #Warns when trying to open more than that many links
+    "batch_warning": "20",
+    #Delay between opening links in milliseconds
+    "delay": "250",
+    #Default directory when selecting file
+    "defaultdir": str(DESKTOP),
+    #Closes program after opening links if True
+    "autoclose": "False",
+    #Opens text file in default text editor if True
+    "opentxtfile": "False",
+    #Automatically selects saved file on startup if True
+    "savetxt": "False",
+    #Filepath to the file to be automatically selected
+    "savedtxtpath": "No File Selected",
+    #Ignores opening links ending with '--' if True
+    "ignore_dashes": "True",
+    #Skips links leading to the same page as an earlier link if True
+    "dedupe": "False",
+    #Number of links above which duplicate links are found with a Bloom filter to save memory
+    "dedupe_bloom_threshold": "1000000",
+    #Skips links opened before by an unfinished batch of the same links if True
+    "resume_batches": "True",
+    #Skips links which have been opened before in any batch if True
+    "skip_opened": "False",
+    #Number of links passed to the browser every time it is started (1 opens one link at a time)
+    "links_per_launch": "1",
+    #Number of browser launches allowed right after each other before the delay applies
+    "burst": "1",
+    #Minimum delay between opening links on the same host in milliseconds (0 opens links in order of the file)
+    "host_delay": "0",
+    #Keeps an index of comment words next to the text file to speed up whole word filters if True
+    "word_index": "False",
+    #Keeps opening links added to the file after the batch has been opened if True
+    "follow_file": "False",
+    #Delay between checking a followed file for new lines in milliseconds
+    "follow_interval": "1000",
+    #Writes phase timings and browser launch latencies to this file after every batch (empty turns metrics off)
+    "metrics_file": "",
+    #Format of the metrics file, json or prometheus
+    "metrics_format": "json",
+    #Checks if links lead to a page before opening them: off, flag (warn about dead links) or drop (skip dead links)
+    "check_links": "off",
+    #Time to wait for a server to answer when checking a link in milliseconds
+    "check_timeout": "5000",
+    #Number of links checked at the same time
+    "check_workers": "16",
+    #Number of seconds the result of checking a link is reused for
+    "check_cache_ttl": "3600",
+    #Adds the comment of every link to exported links if True
+    "export_comments": "False",
+    #Adds the file and line number every link was read from to exported links if True
+    "export_line_numbers": "False",
+}
 
 if has_config:
     #Reads config.ini if it exists
     config.read("config.ini")
+    #Adds settings missing from a config.ini created by an older version
+    missing_settings = [(section, k, v) for section in ("DEFAULT", "USERCONFIG") 
+                        for k, v in DEFAULT_SETTINGS.items() if not config.has_option(section, k)]
+    for section, k, v in missing_settings:
+        set_config_value(section, k, v)
+    if missing_settings != []:
+        write_config()
 else:
     #Creates default config.ini if it doesn't exist
     config.add_section("DEFAULT")
     config.add_section("USERCONFIG")
     for section in config.sections():
-        #Warns when trying to open more than that many links
-        config.set(section, "batch_warning", "20")
-        #Delay between opening links in milliseconds
-        config.set(section, "delay", "250")
-        #Default directory when selecting file
-        config.set(section, "defaultdir", str(DESKTOP))
-        #Closes program after opening links if True
-        config.set(section, "autoclose", "False")
-        #Opens text file in default text editor if True
-        config.set(section, "opentxtfile", "False")
-        #Automatically selects saved file on startup if True
-        config.set(section, "savetxt", "False")
-        #Filepath to the file to be automatically selected
-        config.set(section, "savedtxtpath", "No File Selected")
-        #Ignores opening links ending with '--' if True
-        config.set(section, "ignore_dashes", "True")
+        for k, v in DEFAULT_SETTINGS.items():
+            set_config_value(section, k, v)
     config.add_section("BROWSER_PATHS")
     write_config()
 
@@ -51,122 +209,1932 @@ def restore_default_config():
     """Overwrite [USERCONFIG] with [DEFAULT] in config.ini."""
     default_config = config.items("DEFAULT")
     for k, v in default_config:
-        config.set("USERCONFIG", k, v)
+        set_config_value("USERCONFIG", k, v)
     write_config()
 
 def set_int_variable(variable, value):
     """Check if integer value is valid and save value to corresponding variable in config.ini."""
     if str(value).isdigit():
-        config.set("USERCONFIG", variable, str(value))
+        set_config_value("USERCONFIG", variable, value)
         write_config()
     else:
+        #tkinter is only imported when the GUI is used
+        from tkinter import messagebox
         messagebox.showerror("Error", "Value must be a non-negative integer")
 
 def set_str_variable(variable, value):
     """Save string or boolean value to corresponding variable in config.ini."""
-    config.set("USERCONFIG", variable, str(value))
+    set_config_value("USERCONFIG", variable, value)
     write_config()
 
 def open_file_in_default_editor(filename):
     """Open file in system's default program."""
     os.startfile(filename)
 
-def read_file(target_file) -> list:
+class MetricsPhase:
+    """Context manager adding the time spent inside it to a phase of Metrics."""
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.metrics.add_phase(self.name, time.perf_counter() - self.start)
+
+class Metrics:
+    """
+    Time spent in every phase of a run, counts of the items handled and a histogram of browser launch latencies.
+
+    Nothing is measured while enabled is False: phase() returns a shared context manager doing nothing
+    and timed() returns the iterable it is given, so that leaving metrics off costs next to nothing.
+    """
+    def __init__(self, buckets=LAUNCH_LATENCY_BUCKETS):
+        self.enabled = False
+        self.buckets = tuple(buckets)
+        self.reset()
+
+    def reset(self):
+        """Forget everything measured so far."""
+        self.phase_seconds = {}
+        self.phase_runs = {}
+        self.counts = {}
+        #Number of launches per bucket, the last item counts launches slower than the largest bucket
+        self.launch_counts = [0] * (len(self.buckets) + 1)
+        self.launch_seconds = 0.0
+
+    def add_phase(self, name, seconds):
+        """Add one run of a phase taking seconds."""
+        self.phase_seconds[name] = self.phase_seconds.get(name, 0.0) + seconds
+        self.phase_runs[name] = self.phase_runs.get(name, 0) + 1
+
+    def phase(self, name):
+        """Return a context manager timing the code inside it as phase name."""
+        if not self.enabled:
+            return NO_METRICS_PHASE
+        return MetricsPhase(self, name)
+
+    def count(self, name, value=1):
+        """Add value to the count called name."""
+        if self.enabled:
+            self.counts[name] = self.counts.get(name, 0) + value
+
+    def timed(self, name, iterable, count_name=None):
+        """
+        Return iterable, timing the time spent producing its items as phase name.
+
+        The number of items is added to the count called count_name if it is given.
+        """
+        if not self.enabled:
+            return iterable
+        return self.generate_timed(name, iterable, count_name)
+
+    def generate_timed(self, name, iterable, count_name):
+        """Yield the items of iterable for timed(), adding up the time spent waiting for each one."""
+        iterator = iter(iterable)
+        seconds = 0.0
+        items = 0
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    seconds += time.perf_counter() - start
+                items += 1
+                yield item
+        finally:
+            self.add_phase(name, seconds)
+            if count_name is not None:
+                self.count(count_name, items)
+
+    def timed_function(self, name, function):
+        """Return function, timing every call to it as a run of phase name."""
+        if not self.enabled:
+            return function
+        def timed_call(*args):
+            start = time.perf_counter()
+            try:
+                return function(*args)
+            finally:
+                self.add_phase(name, time.perf_counter() - start)
+        return timed_call
+
+    def observe_launch(self, seconds, link_count):
+        """Add a browser launch which took seconds and opened link_count links."""
+        self.launch_counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.launch_seconds += seconds
+        self.count("launches")
+        self.count("links_opened", link_count)
+
+    def get_cumulative_launches(self) -> list:
+        """Return (upper bound, number of launches taking at most upper bound) tuples, ending with "+Inf"."""
+        bounds = [f"{bucket:g}" for bucket in self.buckets] + ["+Inf"]
+        return list(zip(bounds, itertools.accumulate(self.launch_counts)))
+
+    def to_json(self) -> str:
+        """Return everything measured as a JSON document."""
+        return json.dumps({
+            "phases": {name: {"seconds": self.phase_seconds[name], "runs": self.phase_runs[name]} 
+                       for name in sorted(self.phase_seconds)},
+            "counts": dict(sorted(self.counts.items())),
+            "launch_latency_seconds": {"buckets": dict(self.get_cumulative_launches()),
+                                       "sum": self.launch_seconds, "count": sum(self.launch_counts)},
+        }, indent=2) + "\n"
+
+    def to_prometheus(self) -> str:
+        """Return everything measured in the Prometheus text exposition format."""
+        lines = ["# HELP link_opener_phase_seconds_total Seconds spent in each phase.",
+                 "# TYPE link_opener_phase_seconds_total counter"]
+        lines += [f'link_opener_phase_seconds_total{{phase="{name}"}} {self.phase_seconds[name]}' for name in sorted(self.phase_seconds)]
+        lines += ["# HELP link_opener_phase_runs_total Number of times each phase has run.",
+                  "# TYPE link_opener_phase_runs_total counter"]
+        lines += [f'link_opener_phase_runs_total{{phase="{name}"}} {self.phase_runs[name]}' for name in sorted(self.phase_runs)]
+        for name, value in sorted(self.counts.items()):
+            lines += [f"# TYPE link_opener_{name}_total counter", f"link_opener_{name}_total {value}"]
+        lines += ["# HELP link_opener_launch_latency_seconds Seconds taken to start the browser with a launch of links.",
+                  "# TYPE link_opener_launch_latency_seconds histogram"]
+        lines += [f'link_opener_launch_latency_seconds_bucket{{le="{bound}"}} {launches}' for bound, launches in self.get_cumulative_launches()]
+        lines += [f"link_opener_launch_latency_seconds_sum {self.launch_seconds}",
+                  f"link_opener_launch_latency_seconds_count {sum(self.launch_counts)}"]
+        return "\n".join(lines) + "\n"
+
+    def export(self, target_file, format="json"):
+        """Write everything measured to target_file, or to standard output if target_file is '-'."""
+        text = self.to_prometheus() if format == "prometheus" else self.to_json()
+        if target_file == "-":
+            sys.stdout.write(text)
+            return
+        with open(target_file, "w") as file:
+            file.write(text)
+
+#Returned by Metrics.phase() while metrics are turned off
+NO_METRICS_PHASE = contextlib.nullcontext()
+#Measurements of the current run, turned on by the metrics_file setting or --metrics
+metrics = Metrics()
+
+def parse_line(line) -> list:
+    """
+    Format a single line of the .txt-file.
+
+    Return a list with the URL in index 0 and the comment (if there is one) in index 1.
+    Empty lines return an empty list.
+    """
+    line = line.strip()
+    line = line.lower()
+    line_contents = line.split(None,1)
+    if len(line_contents) > 1:
+        #Replaces "\t" with spaces in the comment (if there is a comment)
+        x = line_contents[1].split("\t")
+        x = " ".join(x)
+        line_contents[1] = x
+    return line_contents
+
+def get_compression(target_file):
+    """Return the name of the format a file is compressed with, found from its first bytes, or None if it is not compressed."""
+    with open(target_file, "rb") as file:
+        head = file.read(6)
+    for magic, compression in COMPRESSION_MAGIC.items():
+        if head.startswith(magic):
+            return compression
+    return None
+
+class ZstdReader(io.RawIOBase):
+    """
+    Read the decompressed contents of a .zst file with the zstandard package.
+
+    Seeking works the same way as in the compressed files of the standard library: forward by decompressing 
+    up to the new position and backward by decompressing again from the start.
+    """
+    def __init__(self, target_file):
+        self.target_file = target_file
+        self.reader = None
+        self.rewind()
+
+    def rewind(self):
+        """Start decompressing the file again from the start."""
+        import zstandard
+        if self.reader is not None:
+            self.reader.close()
+        self.reader = zstandard.open(self.target_file, "rb")
+        self.position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        count = self.reader.readinto(buffer)
+        self.position += count
+        return count
+
+    def tell(self) -> int:
+        return self.position
+
+    def seek(self, offset, whence=io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self.position
+        elif whence != io.SEEK_SET:
+            raise io.UnsupportedOperation("Can not seek from the end of a compressed file")
+        if offset < self.position:
+            self.rewind()
+        while self.position < offset:
+            skipped = len(self.reader.read(min(offset - self.position, io.DEFAULT_BUFFER_SIZE * 128)))
+            if skipped == 0:
+                break
+            self.position += skipped
+        return self.position
+
+    def close(self):
+        if self.reader is not None:
+            self.reader.close()
+        super().close()
+
+def open_zstd_file(target_file):
+    """Return a binary file object of the decompressed contents of a .zst file, and the exception raised for invalid data."""
+    #zstd is only in the standard library from Python 3.14, otherwise the zstandard package is used if installed
+    try:
+        from compression import zstd
+        return zstd.ZstdFile(target_file), zstd.ZstdError
+    except ImportError:
+        pass
+    try:
+        import zstandard
+    except ImportError:
+        raise OSError(f"Reading zstd compressed files requires Python 3.14 or the zstandard package: {target_file}") from None
+    return io.BufferedReader(ZstdReader(target_file)), zstandard.ZstdError
+
+@contextlib.contextmanager
+def open_link_file(target_file):
+    """
+    Open a file of links for reading in binary mode, decompressing it while it is read if it is compressed.
+
+    gzip, bzip2, xz and zstd files are detected by their first bytes and decompressed a block at a time,
+    so that no decompressed copy is written to disk or kept in memory. Seeking in a compressed file 
+    decompresses it up to the new position. Raise OSError if the compressed data is invalid or cut off.
+    """
+    compression = get_compression(target_file)
+    errors = (EOFError,)
+    match compression:
+        case "gzip":
+            import gzip
+            file = gzip.open(target_file, "rb")
+            errors += (zlib.error,)
+        case "bzip2":
+            import bz2
+            file = bz2.open(target_file, "rb")
+        case "xz":
+            import lzma
+            file = lzma.open(target_file, "rb")
+            errors += (lzma.LZMAError,)
+        case "zstd":
+            file, zstd_error = open_zstd_file(target_file)
+            errors += (zstd_error,)
+        case _:
+            file = open(target_file, "rb")
+    try:
+        with file:
+            yield file
+    except errors as error:
+        raise OSError(f"Compressed file can not be read: {target_file} ({error})") from error
+
+def read_file(target_file):
     """ 
-    Generate a formatted list.
+    Generate formatted lines.
 
-    Read a .txt file and return a formatted list to be read for the script.
+    Read a .txt file one line at a time and yield each line formatted to be read for the script.
+    The file is never loaded into memory as a whole, and compressed files are decompressed while they are read.
     
-    Each entry in the list corresponds to one line in the .txt-file and consists of another list with 2 indices:
+    Each yielded entry corresponds to one line in the .txt-file and consists of a list with 2 indices:
     Index 0 stores the URL as a string
     Index 1 stores the comment (if there is one) next to the URL as a string
     """
-    formatted_list = []
-    with open (target_file, "r") as file:
-        file_contents = file.readlines()
-        for f in file_contents:
-            f = f.strip()
-            f = f.lower()
-            line_contents = f.split(None,1)
-            if len(line_contents) > 1:
-                #Replaces "\t" with spaces in the comment (if there is a comment)        
-                x = line_contents[1].split("\t")    
-                x = " ".join(x)
-                line_contents[1] = x
-            formatted_list.append(line_contents)
-    return formatted_list
-
-
-def filter_by_phrase(list, phrase) -> list:
-    """
-    Generate a filtered list based on phrase.
+    with open_link_file(target_file) as file:
+        #Decodes the same way as opening the file in text mode
+        for f in io.TextIOWrapper(file):
+            yield parse_line(f)
+
+
+def read_raw_lines(file, complete_only=False):
+    """
+    Generate the lines of a binary file object as bytes, from its current position.
+
+    Lines are split the same way as read_file() splits them: a line ends with '\n', '\r\n' or a lone '\r',
+    so that line numbers and byte offsets found from the raw bytes match the formatted lines.
+    If complete_only is True, the last line is left out unless it ends with '\n', 
+    as a file being written to may not have finished it yet ('\r' may still be followed by '\n').
+    """
+    #latin-1 maps every byte to a single character, so the lengths of the lines are their lengths in bytes
+    text = io.TextIOWrapper(file, encoding="latin-1", newline="")
+    try:
+        previous = None
+        for line in text:
+            if previous is not None:
+                #Every line followed by another line has ended
+                yield previous
+            previous = line.encode("latin-1")
+        if previous is not None and (not complete_only or previous.endswith(b"\n")):
+            yield previous
+    finally:
+        #Releases the file without closing it
+        text.detach()
+
+def filter_by_phrase(list, phrase):
+    """
+    Generate a filtered stream based on phrase.
     
-    Take a list of list and return only the items containing the provided phrase in index 1.
+    Take an iterable of lists and yield only the items containing the provided phrase in index 1.
     """
-    phrase = phrase.lower()
-    filtered_list = []
-    for line in list:
-        if len(line) == 2:
-            #Skips if no comment (Index 1 represents the comment)
-            if phrase in line[1]:
-                filtered_list.append(line)
-    return filtered_list
+    matches = make_filter_predicate("Phrase", phrase)
+    for line in filter_empty_lines(list):
+        if matches(None, line):
+            yield line
 
 
-def filter_by_domain(list, phrase) -> list:
+def filter_by_keywords(list, keywords):
     """
-    Generate a filtered list based on phrase.
+    Generate a filtered stream based on several phrases.
 
-    Take a list of list and return only the items containing the provided phrase in index 0.
+    Take an iterable of lists and yield only the items containing any of the provided keywords in index 1.
     """
-    phrase = phrase.lower()
-    filtered_list = []
-    for line in list:
-        if len(line) > 0:
-            #Skips empty lines
-            if phrase in line[0]:
-                filtered_list.append(line)
-    return filtered_list
+    matches = make_filter_predicate("Keywords", "\n".join(keywords))
+    for line in filter_empty_lines(list):
+        if matches(None, line):
+            yield line
 
 
-def filter_by_lines(list, start, end) -> list:
+def filter_by_domain(list, phrase):
     """
-    Generate a filtered list based on a given range of numbers.
+    Generate a filtered stream based on phrase.
 
-    Take a list of list and return only the items at the provided indices.
+    Take an iterable of lists and yield only the items containing the provided phrase in index 0.
     """
-    newlist = []
-    [newlist.append(list[n]) for n in range(start-1, end)]
-    return newlist
+    matches = make_filter_predicate("Domain", phrase)
+    for line in filter_empty_lines(list):
+        if matches(None, line):
+            yield line
+
 
-def filter_ignored_links(list) -> list:
+def filter_by_lines(list, start, end):
+    """
+    Generate a filtered stream based on a given range of numbers.
+
+    Take an iterable of lists and yield only the items at the provided line numbers.
+    Raise IndexError if the range goes past the last line.
+    """
+    line_number = start - 1
+    for line in itertools.islice(list, start-1, end):
+        line_number += 1
+        yield line
+    if line_number < end:
+        #Range is out of bounds
+        raise IndexError("Line range exceeds number of lines in file")
+
+def build_line_index(target_file) -> dict:
     """
-    Generate a filtered list based on links that contains two dashes at the end.
+    Generate a line offset index.
 
-    Take a list of list and return only the items which do not end with '--' in index 0.
+    Read a .txt file and return a dict with the byte offset of every LINE_INDEX_STEP-th line,
+    along with the number of lines and the size and modification time of the file it was built from.
+    Offsets in a compressed file are positions in its decompressed contents.
     """
-    filtered_list = []
+    file_stat = os.stat(target_file)
+    offsets = [0]
+    line_count = 0
+    position = 0
+    with open_link_file(target_file) as file:
+        for line in read_raw_lines(file):
+            position += len(line)
+            line_count += 1
+            if line_count % LINE_INDEX_STEP == 0:
+                #Offset of the first byte of line number line_count + 1
+                offsets.append(position)
+    return {"size": file_stat.st_size, "mtime": file_stat.st_mtime_ns, "step": LINE_INDEX_STEP, "newlines": "universal",
+            "line_count": line_count, "offsets": offsets}
+
+def load_line_index(target_file) -> dict:
+    """
+    Return the line offset index of a .txt file.
+
+    Read the index from its sidecar file if it is still valid for the current size and modification time of the file.
+    Otherwise build a new index and save it to the sidecar file.
+    """
+    index_file = str(target_file) + LINE_INDEX_SUFFIX
+    file_stat = os.stat(target_file)
+    try:
+        with open(index_file, "r") as file:
+            index = json.load(file)
+        #Indexes counting only '\n' as the end of a line are built again
+        if ((index["size"], index["mtime"], index["step"], index.get("newlines")) 
+                == (file_stat.st_size, file_stat.st_mtime_ns, LINE_INDEX_STEP, "universal")):
+            return index
+    except (OSError, ValueError, KeyError):
+        #Index file is missing or unreadable
+        pass
+    index = build_line_index(target_file)
+    try:
+        with open(index_file, "w") as file:
+            json.dump(index, file)
+    except OSError:
+        #Index is still used for this run if the directory is not writable
+        pass
+    return index
+
+def read_line_range(target_file, start, end):
+    """
+    Generate formatted lines in a given range of line numbers.
+
+    Seek straight to the closest indexed line before start instead of reading the whole file.
+    Yield the same formatted lines as read_file() for every line from start to end.
+    Raise IndexError if the range goes past the last line.
+    """
+    index = load_line_index(target_file)
+    if start < 1 or end > index["line_count"]:
+        #Range is out of bounds
+        raise IndexError("Line range exceeds number of lines in file")
+    checkpoint = (start - 1) // index["step"]
+    first_line = checkpoint * index["step"] + 1
+    with open_link_file(target_file) as file:
+        file.seek(index["offsets"][checkpoint])
+        #Decodes the same way as read_file() from the seeked position
+        text = io.TextIOWrapper(file)
+        for f in itertools.islice(text, start - first_line, end - first_line + 1):
+            yield parse_line(f)
+
+def read_lines_at(target_file, line_numbers):
+    """
+    Generate formatted lines at specific line numbers.
+
+    Seek to the closest indexed line before every requested line instead of reading the whole file.
+    Yield a (line number, formatted line) tuple for every line number, in ascending order.
+    """
+    index = load_line_index(target_file)
+    line_numbers = sorted(line_number for line_number in line_numbers if 1 <= line_number <= index["line_count"])
+    with open_link_file(target_file) as file:
+        #Groups the requested lines by the indexed line they come after
+        for checkpoint, group in itertools.groupby(line_numbers, lambda line_number: (line_number - 1) // index["step"]):
+            group = list(group)
+            first_line = checkpoint * index["step"] + 1
+            file.seek(index["offsets"][checkpoint])
+            text = io.TextIOWrapper(file)
+            wanted = set(group)
+            for line_number, f in enumerate(itertools.islice(text, group[-1] - first_line + 1), first_line):
+                if line_number in wanted:
+                    yield line_number, parse_line(f)
+            #Releases the file without closing it
+            text.detach()
+
+def tokenize_comment(comment) -> list:
+    """Return the words in a comment."""
+    return re.findall(r"\w+", comment)
+
+def parse_word_query(words) -> tuple:
+    """
+    Return the words of a whole word filter value.
+
+    Return a tuple of the set of words to match exactly and the tuple of prefixes to match from words ending with '*'.
+    """
+    words = re.findall(r"\w+\*?", words.lower())
+    exact = {word for word in words if not word.endswith("*")}
+    prefixes = tuple(word[:-1] for word in words if word.endswith("*"))
+    return exact, prefixes
+
+def update_word_index(target_file) -> str:
+    """
+    Create or update the word index of a .txt file and return the path to it.
+
+    The word index is a SQLite database storing the line number of every word in every comment.
+    Only lines added to the end of the file since the last update are parsed if a checksum of the indexed part 
+    shows that it is unchanged, otherwise the whole index is rebuilt.
+    """
+    index_file = str(target_file) + WORD_INDEX_SUFFIX
+    encoding = locale.getpreferredencoding(False)
+    with sqlite3.connect(index_file) as db:
+        db.execute("CREATE TABLE IF NOT EXISTS info (key TEXT PRIMARY KEY, value INTEGER)")
+        db.execute("CREATE TABLE IF NOT EXISTS postings (token TEXT, line INTEGER, PRIMARY KEY (token, line)) WITHOUT ROWID")
+        info = dict(db.execute("SELECT key, value FROM info"))
+        file_stat = os.stat(target_file)
+        if info.get("mtime") == file_stat.st_mtime_ns and info.get("size") == file_stat.st_size:
+            #Index is up to date
+            return index_file
+        with open_link_file(target_file) as file:
+            indexed_size, line_count = info.get("indexed_size", 0), info.get("line_count", 0)
+            #Checksum of the whole indexed part, so that a change anywhere in it is found, not only at its end
+            checksum, remaining = 0, indexed_size
+            while remaining > 0:
+                chunk = file.read(min(remaining, 1024 * 1024))
+                if chunk == b"":
+                    break
+                checksum = zlib.crc32(chunk, checksum)
+                remaining -= len(chunk)
+            if remaining > 0 or checksum != info.get("checksum", 0):
+                #Indexed part of the file has changed
+                db.execute("DELETE FROM postings")
+                indexed_size, line_count, checksum = 0, 0, 0
+                file.seek(0)
+            else:
+                #Removes the last line if it had not ended yet when it was indexed
+                db.execute("DELETE FROM postings WHERE line > ?", (line_count,))
+            postings = []
+            line_number = line_count
+            position, running_checksum = indexed_size, checksum
+            for raw_line in read_raw_lines(file):
+                #Every line followed by another line has ended
+                indexed_size, line_count, checksum = position, line_number, running_checksum
+                line_number += 1
+                line = parse_line(raw_line.decode(encoding, errors="replace"))
+                if len(line) == 2:
+                    postings.extend((token, line_number) for token in set(tokenize_comment(line[1])))
+                position += len(raw_line)
+                running_checksum = zlib.crc32(raw_line, running_checksum)
+                if raw_line.endswith(b"\n"):
+                    indexed_size, line_count, checksum = position, line_number, running_checksum
+                if len(postings) >= 100000:
+                    db.executemany("INSERT OR IGNORE INTO postings VALUES (?, ?)", postings)
+                    postings.clear()
+            db.executemany("INSERT OR IGNORE INTO postings VALUES (?, ?)", postings)
+        info = {"mtime": file_stat.st_mtime_ns, "size": file_stat.st_size, "indexed_size": indexed_size, 
+                "line_count": line_count, "checksum": checksum}
+        db.executemany("INSERT OR REPLACE INTO info VALUES (?, ?)", info.items())
+    return index_file
+
+def lookup_words(target_file, words) -> set:
+    """
+    Return the line numbers of all lines which comments contain every word, using the word index of the file.
+
+    Words ending with '*' match every word starting with the rest of the word.
+    """
+    index_file = update_word_index(target_file)
+    exact, prefixes = parse_word_query(words)
+    line_numbers = None
+    with sqlite3.connect(index_file) as db:
+        queries = [("SELECT line FROM postings WHERE token = ?", (word,)) for word in exact]
+        queries += [("SELECT line FROM postings WHERE token >= ? AND token < ?", (prefix, prefix + "\uffff")) for prefix in prefixes]
+        for query, parameters in queries:
+            matches = {row[0] for row in db.execute(query, parameters)}
+            line_numbers = matches if line_numbers is None else line_numbers & matches
+            if not line_numbers:
+                break
+    return line_numbers or set()
+
+@functools.lru_cache(maxsize=REGEX_CACHE_SIZE)
+def compile_link_pattern(pattern):
+    """Return the compiled regular expression of a regex filter, matching URLs without regard to case."""
+    return re.compile(pattern, re.IGNORECASE)
+
+@functools.lru_cache(maxsize=REGEX_CACHE_SIZE)
+def compile_raw_link_patterns(pattern):
+    """
+    Return bytes regular expressions finding every line of a file which may have a URL matching a regex filter,
+    or None if the pattern can not be searched for in the raw file.
+
+    Return a tuple of a pattern for lowercased ASCII text and a slower pattern for text which may have non-ASCII bytes,
+    which also finds every line with non-ASCII bytes, as the bytes pattern can read them differently,
+    and every line starting with whitespace, which is not part of the URL.
+    The pattern for lowercased text is case-sensitive, so that it can be searched for faster, 
+    unless the pattern has uppercase letters or escaped character codes, which could only match uppercase letters.
+    Patterns with any of RAW_PATTERN_UNSAFE_TOKENS, global inline flags, which match an empty string or which are not ASCII 
+    can match differently in the raw line than in the URL, so they are not searched for.
+    """
+    if (not pattern.isascii() or any(token in pattern for token in RAW_PATTERN_UNSAFE_TOKENS) 
+            or GLOBAL_FLAGS_PATTERN.match(pattern) is not None or compile_link_pattern(pattern).search("") is not None):
+        return None
+    ignore_case = pattern != pattern.lower() or re.search(r"\\[0-9x]", pattern) is not None
+    try:
+        ascii_pattern = re.compile(pattern.encode("ascii"), (re.IGNORECASE if ignore_case else 0) | re.MULTILINE)
+        mixed_pattern = re.compile(b"(?:" + pattern.encode("ascii") + rb")|[\x80-\xff]|^[ \t\r\f\v]", re.IGNORECASE | re.MULTILINE)
+    except re.error:
+        return None
+    return ascii_pattern, mixed_pattern
+
+def find_pattern_lines(target_file, raw_patterns) -> list:
+    """
+    Return the numbers of the lines of a file found by the patterns from compile_raw_link_patterns().
+
+    The memory-mapped bytes of the file are searched in a single pass, a chunk of whole lines at a time,
+    and every line a match touches is returned, so that the lines found still have to be checked by the regex filter.
+    The slower pattern is only used for chunks with non-ASCII bytes or lines starting with whitespace.
+    Return None if the file has a line ending in '\r' alone, as lines are only counted by their '\n'.
+    """
+    ascii_pattern, mixed_pattern = raw_patterns
+    line_numbers = []
+    with open(target_file, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+        if size == 0:
+            return line_numbers
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            chunk_start, line_number = 0, 1
+            while chunk_start < size:
+                chunk_end = buffer.find(b"\n", min(chunk_start + REGEX_CHUNK_SIZE, size) - 1)
+                chunk_end = size if chunk_end == -1 else chunk_end + 1
+                chunk = buffer[chunk_start:chunk_end]
+                if b"\r" in chunk and chunk.count(b"\r") != chunk.count(b"\r\n"):
+                    #read_file() would split the line at the '\r', which would change the numbers of the lines after it
+                    return None
+                plain = chunk.isascii() and chunk[:1] not in b" \t\r\f\v" and not any(
+                    b"\n" + space in chunk for space in (b" ", b"\t", b"\r", b"\f", b"\v"))
+                position = 0
+                matches = ascii_pattern.finditer(chunk.lower()) if plain else mixed_pattern.finditer(buffer, chunk_start, chunk_end)
+                for match in matches:
+                    start, end = match.start(), match.end()
+                    if not plain:
+                        start, end = start - chunk_start, end - chunk_start
+                    line_number += chunk.count(b"\n", position, start)
+                    last_line = line_number + chunk.count(b"\n", start, end)
+                    first_line = line_number if line_numbers == [] else max(line_number, line_numbers[-1] + 1)
+                    line_numbers.extend(range(first_line, last_line + 1))
+                    line_number, position = last_line, end
+                line_number += chunk.count(b"\n", position)
+                chunk_start = chunk_end
+    return line_numbers
+
+def filter_empty_lines(list):
+    """Take an iterable of lists and yield only the items which are not empty lines."""
     for line in list:
-        if line[0][-2::] != "--":
-            #Checks if the last two characters of the domain are not '--'
-            filtered_list.append(line)
-    return filtered_list
+        if len(line) > 0:
+            yield line
 
-def strip_dashes_from_links(list) -> list:
+def filter_ignored_links(list):
     """
-    Generate a modified list.
+    Generate a filtered stream based on links that contains two dashes at the end.
 
-    Take a list of list and return a list where index 0 has had '--' removed from its end.
+    Take an iterable of lists and yield only the items which do not end with '--' in index 0.
+    """
+    matches = make_filter_predicate("Ignore", None)
+    for line in list:
+        if matches(None, line):
+            yield line
+
+def strip_dashes_from_links(list):
+    """
+    Generate a modified stream.
+
+    Take an iterable of lists and yield the items after index 0 has had '--' removed from its end.
     """
-    filtered_list = []
     for line in list:
         if line[0][-2::] == "--":
-            line[0] = line[0][:-2:]
-        filtered_list.append(line)
-    return filtered_list
+            #Yields a copy so that cached lines are left unchanged
+            line = [line[0][:-2:]] + line[1:]
+        yield line
+
+class LinkTable:
+    """
+    Formatted lines of a file stored column by column instead of as a list per line.
+
+    The URL, comment, line number and ignored flag of every non-empty line are kept in parallel arrays,
+    so that a stored line costs a few bytes on top of its strings. Empty lines are dropped when the table is built.
+    Filters narrow the table to arrays of row indices, and lines are only built again for the links to open.
+    """
+    __slots__ = ("urls", "comments", "line_numbers", "ignored")
+
+    def __init__(self, numbered_lines=()):
+        self.urls = []
+        #None for lines without a comment
+        self.comments = []
+        self.line_numbers = array.array("I")
+        #1 for links ending with '--'
+        self.ignored = bytearray()
+        for line_number, line in numbered_lines:
+            if len(line) > 0:
+                self.append(line_number, line)
+
+    def __len__(self):
+        return len(self.urls)
+
+    def append(self, line_number, line):
+        """Add a non-empty formatted line as the last row."""
+        self.urls.append(line[0])
+        self.comments.append(line[1] if len(line) == 2 else None)
+        self.line_numbers.append(line_number)
+        self.ignored.append(line[0][-2::] == "--")
+
+    def row(self, index) -> list:
+        """Return the formatted line of a row, the same as parse_line() returned it."""
+        comment = self.comments[index]
+        return [self.urls[index]] if comment is None else [self.urls[index], comment]
+
+    def get_rows(self, indices=None):
+        """Return indices, or every row index if indices is None."""
+        return range(len(self.urls)) if indices is None else indices
+
+    def not_ignored(self, indices=None) -> array.array:
+        """Return the indices of the rows, out of all rows or the rows at indices, whose links do not end with '--'."""
+        ignored = self.ignored
+        return array.array("I", (index for index in self.get_rows(indices) if not ignored[index]))
+
+    def select(self, predicate, indices=None) -> array.array:
+        """Return the indices of the rows, out of all rows or the rows at indices, whose lines pass predicate."""
+        line_numbers, row = self.line_numbers, self.row
+        return array.array("I", (index for index in self.get_rows(indices) if predicate(line_numbers[index], row(index))))
+
+    def link(self, index) -> list:
+        """Return the formatted line of a row with '--' removed from the end of index 0."""
+        url = self.urls[index][:-2:] if self.ignored[index] else self.urls[index]
+        comment = self.comments[index]
+        return [url] if comment is None else [url, comment]
+
+    def links(self, indices=None):
+        """Yield the links of all rows, or of the rows at indices, as returned by link()."""
+        return map(self.link, self.get_rows(indices))
+
+class LinkView:
+    """
+    Read-only list of the links in the rows of a LinkTable at an array of row indices.
+
+    Links are built from the table when they are used, so that filtering a table copies no lines.
+    Compares equal to a list of the same links.
+    """
+    __slots__ = ("table", "indices")
+
+    def __init__(self, table, indices=None):
+        self.table = table
+        self.indices = table.get_rows(indices)
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __iter__(self):
+        return self.table.links(self.indices)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return LinkView(self.table, self.indices[index])
+        return self.table.link(self.indices[index])
+
+    def __eq__(self, other):
+        if not isinstance(other, (list, LinkView)) or len(self) != len(other):
+            return False
+        return all(link == other_link for link, other_link in zip(self, other))
+
+    __hash__ = None
+
+    def __reduce__(self):
+        #Sent to other processes as a plain list of links instead of together with the whole table
+        return (list, (list(self),))
+
+def get_cache_key(target_file, filter_key) -> tuple:
+    """Return the key identifying the current version of a file and a filter in the link cache."""
+    file_stat = os.stat(target_file)
+    return (os.path.abspath(target_file), file_stat.st_mtime_ns, file_stat.st_size, filter_key)
+
+def get_cache_size(entries) -> int:
+    """
+    Return how many lines a set of link cache entries keeps in memory.
+
+    Views of a LinkTable keep the whole table in memory, so every table the entries hold 
+    counts with all of its lines once, no matter how many of the entries refer to it.
+    """
+    size = 0
+    tables = {}
+    for cached in entries:
+        table = cached if isinstance(cached, LinkTable) else getattr(cached, "table", None)
+        if table is None:
+            size += len(cached)
+        else:
+            tables[id(table)] = len(table)
+    return size + sum(tables.values())
+
+def get_cached_links(target_file, filter_key, generate_links) -> list:
+    """
+    Return a list of formatted lines (or another sized object) for a file and filter, reusing the result of earlier calls.
+
+    Results are stored for the path, modification time and size of the file together with filter_key.
+    generate_links is called to build the list if there is no stored result for the current version of the file.
+    The least recently used results are removed when more than LINK_CACHE_MAX_LINES lines are kept in memory,
+    counting a view of a LinkTable at the size of its table.
+    """
+    key = get_cache_key(target_file, filter_key)
+    with link_cache_lock:
+        if key in link_cache:
+            link_cache.move_to_end(key)
+            return link_cache[key]
+    links = generate_links()
+    if get_cache_size([links]) <= LINK_CACHE_MAX_LINES:
+        with link_cache_lock:
+            link_cache[key] = links
+            while get_cache_size(link_cache.values()) > LINK_CACHE_MAX_LINES:
+                link_cache.popitem(last=False)
+    return links
+
+def load_link_table(target_file) -> LinkTable:
+    """Return the LinkTable of all lines in a file, reading the file only if it is not in the link cache."""
+    return get_cached_links(target_file, None, 
+                            lambda: LinkTable(metrics.timed("read_file", enumerate(read_file(target_file), 1), "lines_read")))
+
+def read_link_table(target_file, max_lines):
+    """
+    Read the lines of a file into a LinkTable, stopping after max_lines lines.
+
+    Return a tuple of the table and an iterator of the (line number, formatted line) tuples of the lines after it,
+    or None instead of the iterator if the whole file fit in the table, so that a file is read once either way.
+    """
+    lines = metrics.timed("read_file", enumerate(read_file(target_file), 1), "lines_read")
+    table = LinkTable(itertools.islice(lines, max_lines))
+    next_line = next(lines, None)
+    return table, None if next_line is None else itertools.chain([next_line], lines)
+
+def get_cached_entry(target_file, filter_key):
+    """Return the result stored in the link cache for a file and filter, or None if there is none."""
+    key = get_cache_key(target_file, filter_key)
+    with link_cache_lock:
+        if key in link_cache:
+            link_cache.move_to_end(key)
+            return link_cache[key]
+    return None
+
+def get_cached_link_table(target_file):
+    """Return the LinkTable of all lines in a file if it is in the link cache, otherwise None."""
+    return get_cached_entry(target_file, None)
+
+def estimate_file_lines(target_file) -> int:
+    """Return about how many lines a file has from its size alone, erring towards more lines than it has."""
+    size = os.path.getsize(target_file)
+    if get_compression(target_file) is not None:
+        size *= ESTIMATED_COMPRESSION_RATIO
+    return size // ESTIMATED_LINE_SIZE + 1
+
+class KeywordMatcher:
+    """
+    Match many keywords in a single pass over a text.
+
+    Build an Aho-Corasick automaton from the keywords, so that searching a text reads every character once 
+    no matter how many keywords are given.
+    """
+    def __init__(self, keywords):
+        #Transitions, failure links and whether a keyword ends in each state of the automaton
+        self.transitions = [{}]
+        failures = [0]
+        self.matches = [False]
+        for keyword in keywords:
+            if keyword == "":
+                continue
+            state = 0
+            for char in keyword:
+                if char not in self.transitions[state]:
+                    self.transitions.append({})
+                    failures.append(0)
+                    self.matches.append(False)
+                    self.transitions[state][char] = len(self.transitions) - 1
+                state = self.transitions[state][char]
+            self.matches[state] = True
+        #Adds failure transitions breadth first, so that every state can move on any character without backtracking
+        queue = list(self.transitions[0].values())
+        for state in queue:
+            for char, next_state in self.transitions[state].items():
+                queue.append(next_state)
+                failure = failures[state]
+                while failure and char not in self.transitions[failure]:
+                    failure = failures[failure]
+                failures[next_state] = self.transitions[failure].get(char, 0) if state else 0
+                self.matches[next_state] = self.matches[next_state] or self.matches[failures[next_state]]
+            for char, next_state in self.transitions[failures[state]].items():
+                self.transitions[state].setdefault(char, next_state)
+
+    def search(self, text) -> bool:
+        """Return True if any keyword is found in text."""
+        transitions, matches = self.transitions, self.matches
+        state = 0
+        for char in text:
+            state = transitions[state].get(char, 0)
+            if matches[state]:
+                return True
+        return False
+
+def read_keyword_file(target_file) -> list:
+    """Return the keywords in a .txt file, one keyword per non-empty line."""
+    with open(target_file, "r") as file:
+        return [line.strip().lower() for line in file if line.strip() != ""]
+
+def normalize_url(url) -> str:
+    """
+    Return the URL in a form which is the same for all URLs leading to the same page.
+
+    Remove default ports, trailing slashes and tracking parameters such as 'utm_source' and 'fbclid'.
+    Links are already lowercase when read from the file.
+    """
+    has_scheme = "://" in url
+    try:
+        parts = urllib.parse.urlsplit(url if has_scheme else "//" + url)
+        host = (parts.hostname or "").rstrip(".")
+        port = parts.port
+    except ValueError:
+        #Leaves links which are not valid URLs as they are
+        return url
+    if port is not None and (parts.scheme, port) not in (("http", 80), ("https", 443)):
+        host = f"{host}:{port}"
+    query = [(k, v) for k, v in urllib.parse.parse_qsl(parts.query, keep_blank_values=True) 
+             if not k.startswith("utm_") and k not in TRACKING_PARAMETERS]
+    normalized = urllib.parse.urlunsplit((parts.scheme, host, parts.path.rstrip("/"), urllib.parse.urlencode(query), parts.fragment))
+    return normalized if has_scheme else normalized.lstrip("/")
+
+class BloomFilter:
+    """
+    Remember which items have been seen using a fixed amount of memory.
+
+    Items that have not been seen are mistaken for seen items at about the given error rate when capacity items have been added.
+    """
+    def __init__(self, capacity, error_rate=0.001):
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / max(1, capacity) * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def add(self, item) -> bool:
+        """Add item and return True if it has (most likely) been added before."""
+        digest = hashlib.blake2b(item.encode("utf-8", errors="replace"), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        seen = True
+        for n in range(self.hash_count):
+            bit = (first + n * second) % self.size
+            if not self.bits[bit >> 3] & (1 << (bit & 7)):
+                seen = False
+                self.bits[bit >> 3] |= 1 << (bit & 7)
+        return seen
+
+class LinkList(list):
+    """List of links to open, which also counts the duplicate, already opened and dead links removed from it."""
+    duplicates = 0
+    already_opened = 0
+    dead = 0
+    #Dead links which were kept in the list to be opened anyway
+    flagged = 0
+
+class LinkDeduplicator:
+    """
+    Remove links leading to the same page as an earlier link.
+
+    Links are compared by normalize_url(). A set of every link seen is used, 
+    unless bloom_capacity is given, in which case a BloomFilter sized for that many links is used to bound memory.
+    If bloom_threshold is given as well, the set is used until more than bloom_threshold links have been seen,
+    and is then replaced by a BloomFilter for bloom_capacity links, or twice the links seen if that is more.
+    """
+    def __init__(self, bloom_capacity=0, bloom_threshold=None):
+        self.bloom_capacity = bloom_capacity
+        self.bloom_threshold = bloom_threshold
+        self.bloom_filter = BloomFilter(bloom_capacity) if bloom_capacity > 0 and bloom_threshold is None else None
+        self.seen = set()
+        self.duplicates = 0
+
+    def is_duplicate(self, url) -> bool:
+        """Return True if a link to the same page has been seen before, and remember the link."""
+        normalized = normalize_url(url)
+        if self.bloom_filter is None and self.bloom_threshold is not None and len(self.seen) > self.bloom_threshold:
+            #Too many links to keep every one of them, so the links seen so far are moved to a Bloom filter
+            self.bloom_filter = BloomFilter(max(self.bloom_capacity, 2 * len(self.seen)))
+            for seen in self.seen:
+                self.bloom_filter.add(seen)
+            self.seen = set()
+        if self.bloom_filter is not None:
+            duplicate = self.bloom_filter.add(normalized)
+        else:
+            duplicate = normalized in self.seen
+            self.seen.add(normalized)
+        if duplicate:
+            self.duplicates += 1
+        return duplicate
+
+    def filter(self, list):
+        """Take an iterable of formatted lines and yield the lines which are not duplicates."""
+        for line in list:
+            if not self.is_duplicate(line[0]):
+                yield line
+
+class LinkHistory:
+    """
+    Record of every link opened and of batches which have not been opened to the end, stored in a SQLite database.
+
+    Links are stored by normalize_url() and looked up through the primary key index, 
+    so that lookups stay fast with millions of links in the history.
+    """
+    def __init__(self, history_file=HISTORY_FILE):
+        self.db = sqlite3.connect(history_file)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("CREATE TABLE IF NOT EXISTS history "
+                        "(url TEXT PRIMARY KEY, first_opened REAL, last_opened REAL, times_opened INTEGER) WITHOUT ROWID")
+        self.db.execute("CREATE TABLE IF NOT EXISTS batches (batch_key TEXT PRIMARY KEY, started REAL, total INTEGER)")
+        self.db.commit()
+
+    def close(self):
+        self.db.close()
+
+    @staticmethod
+    def get_batch_key(link_list) -> str:
+        """Return a key which is the same for every batch of the same links."""
+        digest = hashlib.blake2b(digest_size=16)
+        for link in link_list:
+            digest.update(link[0].encode("utf-8", errors="replace") + b"\n")
+        return digest.hexdigest()
+
+    def get_opened(self, urls, since=None) -> set:
+        """Return the normalized URLs which have been opened, only counting links opened after since if it is given."""
+        normalized = list({normalize_url(url) for url in urls})
+        opened = set()
+        for n in range(0, len(normalized), 500):
+            chunk = normalized[n:n+500]
+            query = f"SELECT url FROM history WHERE url IN ({','.join('?' * len(chunk))})"
+            if since is not None:
+                query += " AND last_opened >= ?"
+                chunk = chunk + [since]
+            opened.update(row[0] for row in self.db.execute(query, chunk))
+        return opened
+
+    def remove_opened(self, link_list, resume=True, skip_opened=False) -> list:
+        """
+        Return the links in list which should be opened.
+
+        If resume is True, links opened by an unfinished batch of the same links are removed.
+        If skip_opened is True, all links opened before are removed.
+        The returned LinkList counts the removed links.
+        """
+        since = None
+        if not skip_opened:
+            row = self.db.execute("SELECT started FROM batches WHERE batch_key = ?", (self.get_batch_key(link_list),)).fetchone()
+            if not resume or row is None:
+                return link_list
+            since = row[0]
+        opened = self.get_opened([link[0] for link in link_list], since)
+        remaining = LinkList(link for link in link_list if normalize_url(link[0]) not in opened)
+        remaining.duplicates = getattr(link_list, "duplicates", 0)
+        remaining.already_opened = len(link_list) - len(remaining)
+        metrics.count("already_opened_skipped", remaining.already_opened)
+        return remaining
+
+    def start_batch(self, batch_key, total):
+        """Remember that a batch has been started, keeping the start time of an unfinished batch of the same links."""
+        self.db.execute("INSERT OR IGNORE INTO batches VALUES (?, ?, ?)", (batch_key, time.time(), total))
+        self.db.commit()
+
+    def record_opened(self, urls):
+        """Add links which have just been opened to the history."""
+        now = time.time()
+        self.db.executemany("INSERT INTO history VALUES (?, ?, ?, 1) ON CONFLICT(url) DO UPDATE "
+                            "SET last_opened = excluded.last_opened, times_opened = times_opened + 1",
+                            [(normalize_url(url), now, now) for url in urls])
+        self.db.commit()
+
+    def finish_batch(self, batch_key):
+        """Forget a batch after all of its links have been opened."""
+        self.db.execute("DELETE FROM batches WHERE batch_key = ?", (batch_key,))
+        self.db.commit()
+
+class ConnectionPool:
+    """
+    Keep-alive HTTP connections, kept apart by host.
+
+    A connection is taken from the pool for a request and put back once the response has been read,
+    so that checking many links on the same host reuses one connection per thread instead of connecting every time.
+    """
+    def __init__(self, timeout):
+        self.timeout = timeout
+        self.idle = {}
+        self.lock = threading.Lock()
+
+    def get(self, scheme, host, port):
+        """Return an idle connection to the host, or a new one if there is none."""
+        with self.lock:
+            connections = self.idle.get((scheme, host, port))
+            if connections:
+                return connections.pop()
+        import http.client
+        connection_class = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return connection_class(host, port, timeout=self.timeout)
+
+    def put(self, scheme, host, port, connection):
+        """Keep a connection whose response has been read to be reused for the same host."""
+        with self.lock:
+            self.idle.setdefault((scheme, host, port), []).append(connection)
+
+    def close(self):
+        """Close every idle connection."""
+        with self.lock:
+            for connection in itertools.chain.from_iterable(self.idle.values()):
+                connection.close()
+            self.idle.clear()
+
+def request_link_status(pool, url) -> tuple:
+    """
+    Return a tuple of the HTTP status of a link and where it redirects to (or the error if it could not be reached).
+
+    A HEAD request is sent without following redirects, and a GET request if the server does not allow HEAD requests.
+    Links without a scheme are requested over HTTP. Non-ASCII characters are percent-encoded in the path and query
+    and IDNA-encoded in the host name. The status is None for links which are not HTTP(S) URLs,
+    and 0 if the server could not be reached, did not answer in time or the URL is not valid.
+    """
+    import http.client
+    if "://" not in url and re.match(r"[a-z][a-z0-9+.-]*:(?![0-9])", url):
+        #Other schemes without '//', such as 'mailto:', as opposed to a host name and port
+        return None, None
+    try:
+        parts = urllib.parse.urlsplit(url if "://" in url else "http://" + url)
+        port = parts.port
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            return None, None
+        host = parts.hostname.encode("idna").decode("ascii")
+    except ValueError as error:
+        #UnicodeError of a host name which can not be IDNA-encoded is a ValueError as well
+        return 0, str(error)
+    #Characters which are already escaped or have a meaning in the URL are kept as they are
+    path = urllib.parse.quote(parts.path or "/", safe="/%:@!$&'()*+,;=~")
+    if parts.query:
+        path += "?" + urllib.parse.quote(parts.query, safe="/?%:@!$&'()*+,;=~")
+    key = (parts.scheme, host, port)
+    for method in ("HEAD", "GET"):
+        for attempt in range(2):
+            connection = pool.get(*key)
+            #A kept connection may have been closed by the server in the meantime, in which case it is tried again once
+            reused = connection.sock is not None
+            try:
+                connection.request(method, path, headers=LINK_CHECK_HEADERS)
+                response = connection.getresponse()
+                if method == "HEAD":
+                    response.read()
+            except (OSError, http.client.HTTPException) as error:
+                connection.close()
+                if reused and attempt == 0:
+                    continue
+                return 0, str(error) or type(error).__name__
+            break
+        if method == "GET" or response.will_close:
+            #Body of a GET response is never read
+            connection.close()
+        else:
+            pool.put(*key, connection)
+        if method == "HEAD" and response.status in (405, 501):
+            continue
+        return response.status, response.getheader("Location")
+
+def is_dead_link(status) -> bool:
+    """Return True if a status from request_link_status() means that the link does not lead to a page."""
+    return status is not None and (status == 0 or status >= 400)
+
+class LinkChecker:
+    """
+    Check if links lead to a page before they are opened, sending requests to many links at the same time.
+
+    At most workers requests are sent at a time, over keep-alive connections pooled by host.
+    Results are stored in a table of the history database and reused for cache_ttl seconds.
+    """
+    def __init__(self, timeout=5.0, workers=16, cache_ttl=3600, cache_file=HISTORY_FILE):
+        self.timeout = timeout
+        self.workers = max(1, workers)
+        self.cache_ttl = cache_ttl
+        self.cache_file = cache_file
+
+    def check(self, urls, on_checked=None) -> dict:
+        """
+        Return a dict of every URL to its (status, redirect location or error) from request_link_status().
+
+        on_checked is called with the number of links checked so far and the number of links to check
+        every time a link has been checked. It is called from the thread running check().
+        """
+        #Connects in the calling thread, as check() may be run on a worker thread of the GUI
+        with contextlib.closing(sqlite3.connect(self.cache_file)) as db:
+            db.execute("CREATE TABLE IF NOT EXISTS link_checks (url TEXT PRIMARY KEY, status INTEGER, detail TEXT, checked REAL) WITHOUT ROWID")
+            unique_urls = list(dict.fromkeys(urls))
+            results = {}
+            for n in range(0, len(unique_urls), 500):
+                chunk = unique_urls[n:n+500]
+                query = f"SELECT url, status, detail FROM link_checks WHERE url IN ({','.join('?' * len(chunk))}) AND checked >= ?"
+                results.update((url, (status, detail)) for url, status, detail in db.execute(query, chunk + [time.time() - self.cache_ttl]))
+            unchecked = [url for url in unique_urls if url not in results]
+            metrics.count("links_checked", len(unchecked))
+            metrics.count("link_checks_cached", len(unique_urls) - len(unchecked))
+            pool = ConnectionPool(self.timeout)
+            try:
+                with concurrent.futures.ThreadPoolExecutor(max_workers=self.workers) as executor:
+                    futures = {executor.submit(request_link_status, pool, url): url for url in unchecked}
+                    for checked, future in enumerate(concurrent.futures.as_completed(futures), 1):
+                        results[futures[future]] = future.result()
+                        if on_checked is not None:
+                            on_checked(checked, len(unchecked))
+            finally:
+                pool.close()
+            now = time.time()
+            db.executemany("INSERT OR REPLACE INTO link_checks VALUES (?, ?, ?, ?)", 
+                           ((url, *results[url], now) for url in unchecked if results[url][0] is not None))
+            db.commit()
+        return results
+
+def check_links(link_list, checker, drop=True, on_checked=None) -> tuple:
+    """
+    Check if the links in list lead to a page and return a tuple of the links which should be opened 
+    and a list of (URL, status, redirect location or error) of every dead link.
+
+    Dead links are removed if drop is True, otherwise they are kept and only counted as flagged.
+    The returned LinkList counts the removed or flagged links along with the links removed before.
+    """
+    results = checker.check([link[0] for link in link_list], on_checked)
+    dead_links = [(url, *results[url]) for url in dict.fromkeys(link[0] for link in link_list) if is_dead_link(results[url][0])]
+    dead_urls = {url for url, status, detail in dead_links}
+    remaining = LinkList(link for link in link_list if not drop or link[0] not in dead_urls)
+    remaining.duplicates = getattr(link_list, "duplicates", 0)
+    remaining.already_opened = getattr(link_list, "already_opened", 0)
+    remaining.dead = len(link_list) - len(remaining)
+    remaining.flagged = 0 if drop else sum(1 for link in link_list if link[0] in dead_urls)
+    metrics.count("dead_links", len(dead_links))
+    return remaining, dead_links
+
+def describe_dead_link(url, status, detail) -> str:
+    """Return a line describing why a link is dead."""
+    return f"{url} ({'HTTP ' + str(status) if status else detail})"
+
+def get_link_checker(timeout=None):
+    """Return a LinkChecker with the settings in config.ini, waiting timeout milliseconds for an answer if given."""
+    timeout = timeout if timeout is not None else int(config.get("USERCONFIG", "check_timeout"))
+    return LinkChecker(timeout / 1000, int(config.get("USERCONFIG", "check_workers")), int(config.get("USERCONFIG", "check_cache_ttl")))
+
+def get_link_host(url) -> str:
+    """Return the host name of a URL, or an empty string if it has none."""
+    if url[-2::] == "--":
+        url = url[:-2:]
+    match = LINK_HOST_PATTERN.match(url)
+    if match is not None and (match.group(1) is not None) == ("://" in url):
+        #Most URLs have nothing but the host name between the scheme and the path
+        return match.group(2).lower().rstrip(".")
+    if "://" not in url:
+        #Links without a scheme, such as 'www.google.com/', start with the host name
+        url = "//" + url
+    try:
+        host = urllib.parse.urlsplit(url).hostname
+    except ValueError:
+        return ""
+    return (host or "").rstrip(".")
+
+def parse_domain_query(filtervalue):
+    """
+    Return the domain to match for a URL filter value, or None if the value is not a domain name.
+
+    Return a tuple of the domain and whether only that exact host should match.
+    A domain matches itself and all of its subdomains, unless it starts with '=', in which case only that exact host matches.
+    """
+    filtervalue = filtervalue.lower().strip()
+    if not re.fullmatch(r"=?[a-z0-9_-]+(\.[a-z0-9_-]+)+\.?", filtervalue):
+        return None
+    exact = filtervalue.startswith("=")
+    return filtervalue.lstrip("=").rstrip("."), exact
+
+class DomainIndex:
+    """
+    Look up the rows of a LinkTable by the host name of their URL.
+
+    Host names are stored in a tree of their labels in reverse order ('www.google.com' is stored as com -> google -> www),
+    so that a domain and all of its subdomains are found without looking at any other host.
+    """
+    def __init__(self, table=None):
+        self.table = table if table is not None else LinkTable()
+        #Every node is a dict of child labels, with the row indices of the host ending at the node stored under None
+        self.root = {}
+        for index, url in enumerate(self.table.urls):
+            self.add(get_link_host(url), index)
+
+    def __len__(self):
+        return len(self.table)
+
+    def add(self, host, index):
+        """Store the index of a row in the table under the host name of its URL."""
+        node = self.root
+        for label in reversed(host.split(".")):
+            node = node.setdefault(label, {})
+        node.setdefault(None, []).append(index)
+
+    def lookup(self, domain, exact=False) -> array.array:
+        """Return the indices of the rows with a URL on the domain (or its subdomains), in order of line number."""
+        node = self.root
+        for label in reversed(domain.split(".")):
+            if label not in node:
+                return array.array("I")
+            node = node[label]
+        if exact:
+            return array.array("I", node.get(None, []))
+        matches = []
+        nodes = [node]
+        for node in nodes:
+            for label, child in node.items():
+                if label is None:
+                    matches.extend(child)
+                else:
+                    nodes.append(child)
+        matches.sort()
+        return array.array("I", matches)
+
+def parse_line_range(filtervalue) -> tuple:
+    """
+    Return the start and end line numbers of a line range filter value.
+
+    Start and end value is split by "," delimiter.
+    Raise ValueError if the values are not integers, if start is greater than end or if any value is 0 or below.
+    """
+    line_index = filtervalue.split(",")
+    start, end = int(line_index[0]), int(line_index[1])
+    if start > end or start < 1:
+        raise ValueError("Invalid line range")
+    return start, end
+
+def make_filter_predicate(filtertype, filtervalue):
+    """
+    Generate the test for a single filter.
+
+    Return a function which takes a line number and a non-empty formatted line and returns True if the line passes the filter.
+    """
+    match filtertype:
+        case "Phrase":
+            phrase = filtervalue.lower()
+            #Lines without a comment never match (Index 1 represents the comment)
+            return lambda line_number, line: len(line) == 2 and phrase in line[1]
+        case "Domain":
+            domain_query = parse_domain_query(filtervalue)
+            if domain_query is None:
+                #Matches any part of the URL if the filter value is not a domain name
+                phrase = filtervalue.lower()
+                return lambda line_number, line: phrase in line[0]
+            domain, exact = domain_query
+            def on_domain(line_number, line):
+                #Only the host names of URLs containing the domain name have to be looked at
+                if domain not in line[0]:
+                    return False
+                host = get_link_host(line[0])
+                return host == domain or (not exact and host.endswith("." + domain))
+            return on_domain
+        case "Words":
+            #Words ending with '*' match every word starting with the rest of the word
+            exact, prefixes = parse_word_query(filtervalue)
+            def has_words(line_number, line):
+                #A value without any words matches no line, the same as when it is looked up in the word index
+                if len(line) < 2 or (not exact and not prefixes):
+                    return False
+                tokens = set(tokenize_comment(line[1]))
+                return exact <= tokens and all(any(token.startswith(prefix) for token in tokens) for prefix in prefixes)
+            return has_words
+        case "Keywords":
+            #Keywords are separated by "\n" in the filter value
+            matcher = KeywordMatcher(filtervalue.lower().split("\n"))
+            return lambda line_number, line: len(line) == 2 and matcher.search(line[1])
+        case "Regex":
+            pattern = compile_link_pattern(filtervalue)
+            return lambda line_number, line: pattern.search(line[0]) is not None
+        case "Lines":
+            start, end = parse_line_range(filtervalue)
+            return lambda line_number, line: start <= line_number <= end
+        case "Ignore":
+            #Checks if the last two characters of the domain are not '--'
+            return lambda line_number, line: line[0][-2::] != "--"
+    raise ValueError(f"Unknown filter type '{filtertype}'")
+
+def compile_filters(filters, match_all=True, ignore_dashes=False):
+    """
+    Combine filters into a single test.
+
+    Take a sequence of (filter type, filter value) tuples and return one function which takes a line number 
+    and a non-empty formatted line.
+    The line must pass every filter if match_all is True, otherwise passing one of the filters is enough.
+    Links ending with '--' never pass if ignore_dashes is True.
+    """
+    predicates = [make_filter_predicate(filtertype, filtervalue) for filtertype, filtervalue in filters]
+    if len(predicates) == 0:
+        #No filter set
+        matches = lambda line_number, line: True
+    elif len(predicates) == 1:
+        matches = predicates[0]
+    elif match_all:
+        matches = lambda line_number, line: all(predicate(line_number, line) for predicate in predicates)
+    else:
+        matches = lambda line_number, line: any(predicate(line_number, line) for predicate in predicates)
+    if ignore_dashes:
+        not_ignored = make_filter_predicate("Ignore", None)
+        return lambda line_number, line: not_ignored(line_number, line) and matches(line_number, line)
+    return matches
+
+def select_links(list, predicate, first_line=1):
+    """
+    Generate the links to open in a single pass.
+
+    Take an iterable of formatted lines, numbered from first_line, and yield the non-empty lines passing predicate 
+    with '--' removed from the end of index 0.
+    """
+    return select_numbered_links(enumerate(list, first_line), predicate)
+
+def select_numbered_links(numbered_lines, predicate):
+    """Same as select_links(), but take an iterable of (line number, formatted line) tuples."""
+    #Time spent reading lines is measured apart from the time spent filtering them
+    numbered_lines = metrics.timed("read_file", numbered_lines, "lines_read")
+    predicate = metrics.timed_function("filter_lines", predicate)
+    return strip_dashes_from_links(line for line_number, line in numbered_lines
+                                   if len(line) > 0 and predicate(line_number, line))
+
+def collect_links(target_file, filters, match_all=True, ignore_dashes=False, dedupe=False, check_ranges=True) -> list:
+    """
+    Return the list of links to open from a file.
+
+    Evaluate all filters in one pass over the file and cache the result for the filter settings.
+    Only the lines in range are read when every matching line has to be inside a line range filter.
+    Only the lines found in the word index are read when every matching line has to pass a whole word filter
+    and the word index is turned on in config.ini.
+    Only the lines on a domain are looked at when every matching line has to pass a domain filter and the file
+    is small enough for its domain index to be kept in the link cache.
+    If dedupe is True, links leading to the same page as an earlier link are removed in the same pass, 
+    and a LinkList counting the removed links is returned.
+    Raise IndexError if a line range goes past the last line of the file, 
+    or only match the lines in range the file has if check_ranges is False.
+    """
+    filters = tuple(filters)
+    line_ranges = [parse_line_range(filtervalue) for filtertype, filtervalue in filters if filtertype == "Lines"]
+    if line_ranges:
+        line_count = load_line_index(target_file)["line_count"]
+        if max(end for start, end in line_ranges) > line_count:
+            if check_ranges:
+                #Range is out of bounds
+                raise IndexError("Line range exceeds number of lines in file")
+            line_ranges = [(start, min(end, line_count)) for start, end in line_ranges]
+
+    def generate_links():
+        links = select_file_links(target_file, filters, match_all, ignore_dashes, line_ranges)
+        if not dedupe:
+            #Links selected from a cached LinkTable are kept as a view of it
+            return links if isinstance(links, LinkView) else list(links)
+        #Switches to a Bloom filter instead of storing every link once the file turns out to have too many links
+        deduplicator = LinkDeduplicator(estimate_file_lines(target_file), int(config.get("USERCONFIG", "dedupe_bloom_threshold")))
+        links = LinkList(deduplicator.filter(links))
+        links.duplicates = deduplicator.duplicates
+        metrics.count("duplicates_skipped", links.duplicates)
+        return links
+
+    with metrics.phase("collect_links"):
+        links = get_cached_links(target_file, (filters, match_all, ignore_dashes, dedupe), generate_links)
+    metrics.count("links_collected", len(links))
+    return links
+
+def select_file_links(target_file, filters, match_all, ignore_dashes, line_ranges):
+    """
+    Return the links to open from a file for collect_links().
+
+    Choose the smallest part of the file which can contain matching lines and return an iterator of the lines in it 
+    passing all filters, or a LinkView if the lines are selected from a LinkTable in the link cache.
+    """
+    predicate = compile_filters(filters, match_all, ignore_dashes)
+    word_filters = [filtervalue for filtertype, filtervalue in filters if filtertype == "Words"]
+    if word_filters and (match_all or len(filters) == 1) and config.get("USERCONFIG", "word_index") == "True":
+        #Every matching line contains the words of all whole word filters
+        candidates = set.intersection(*[lookup_words(target_file, words) for words in word_filters])
+        for start, end in line_ranges:
+            candidates = {line_number for line_number in candidates if start <= line_number <= end}
+        return select_numbered_links(read_lines_at(target_file, candidates), predicate)
+    domain_queries = [parse_domain_query(filtervalue) for filtertype, filtervalue in filters if filtertype == "Domain"]
+    domain_queries = [domain_query for domain_query in domain_queries if domain_query is not None]
+    if domain_queries and (match_all or len(filters) == 1):
+        #Every matching line is on the domain of the first domain filter
+        domain_index = get_cached_entry(target_file, "DomainIndex")
+        if domain_index is None:
+            table, remaining_lines = get_cached_link_table(target_file), None
+            if table is None:
+                table, remaining_lines = read_link_table(target_file, LINK_CACHE_MAX_LINES)
+            if remaining_lines is not None:
+                #File is too large for its domain index to be kept in the link cache, so the lines are only filtered
+                return itertools.chain(select_table_links(table, filters, match_all, ignore_dashes),
+                                       select_numbered_links(remaining_lines, predicate))
+            table = get_cached_links(target_file, None, lambda: table)
+            domain_index = get_cached_links(target_file, "DomainIndex", lambda: DomainIndex(table))
+        return select_table_links(domain_index.table, filters, match_all, ignore_dashes, domain_index.lookup(*domain_queries[0]))
+    raw_patterns = [compile_raw_link_patterns(filtervalue) for filtertype, filtervalue in filters if filtertype == "Regex"]
+    if (raw_patterns and None not in raw_patterns and not line_ranges and (match_all or len(filters) == 1)
+            and get_cached_link_table(target_file) is None and get_compression(target_file) is None):
+        #Every matching line is found by the raw patterns of all regex filters, searched for in the uncompressed file
+        candidates = find_pattern_lines(target_file, raw_patterns[0])
+        if candidates is not None:
+            candidates = set(candidates)
+            for raw_pattern in raw_patterns[1:]:
+                candidates.intersection_update(find_pattern_lines(target_file, raw_pattern))
+            return select_numbered_links(read_lines_at(target_file, candidates), predicate)
+    if line_ranges and (match_all or len(filters) == 1):
+        #Every matching line is inside the overlap of all line ranges
+        start = max(start for start, end in line_ranges)
+        end = min(end for start, end in line_ranges)
+        if start > end:
+            return iter([])
+        return select_links(read_line_range(target_file, start, end), predicate, start)
+    if len(filters) == 0:
+        #Keeps all lines of the file in the cache to be reused by filters
+        return select_table_links(load_link_table(target_file), filters, match_all, ignore_dashes)
+    table = get_cached_link_table(target_file)
+    if table is not None:
+        return select_table_links(table, filters, match_all, ignore_dashes)
+    return select_links(read_file(target_file), predicate)
+
+def select_table_links(table, filters, match_all, ignore_dashes, indices=None):
+    """
+    Return a LinkView of the links to open from the rows of a LinkTable, out of all rows or the rows at indices.
+
+    Ignored links are removed by their flag before the filters narrow the remaining row indices,
+    so that no line is copied.
+    """
+    if ignore_dashes:
+        indices = table.not_ignored(indices)
+    if len(filters) > 0:
+        indices = table.select(metrics.timed_function("filter_lines", compile_filters(filters, match_all)), indices)
+    return LinkView(table, indices)
+
+def expand_link_sources(sources) -> list:
+    """
+    Return the text files selected by a list of sources.
+
+    A source is the path to a file, a directory, which selects every .txt file directly inside it 
+    (compressed or not, see LINK_FILE_PATTERNS), or a glob pattern, which is only used as a pattern 
+    if there is no file at that path.
+    Files are returned in the order of the sources, with the files of a directory or pattern sorted by path 
+    and every file only returned once. Raise FileNotFoundError if a directory or pattern selects no files.
+    """
+    target_files = []
+    for source in sources:
+        if os.path.isfile(source):
+            matches = [source]
+        elif os.path.isdir(source):
+            matches = sorted({str(path) for pattern in LINK_FILE_PATTERNS for path in pathlib.Path(source).glob(pattern) if path.is_file()})
+        elif any(character in source for character in "*?["):
+            matches = sorted(path for path in glob.glob(source) if os.path.isfile(path))
+        else:
+            #A missing file is left for the code reading it to report
+            matches = [source]
+        if matches == []:
+            raise FileNotFoundError(f"No text files found in '{source}'")
+        target_files.extend(matches)
+    return list(dict.fromkeys(target_files))
+
+def encode_link_sources(sources) -> str:
+    """
+    Return the text the sources selected in the GUI are stored as, in the GUI and in config.ini.
+
+    A single source is stored as its path, as before several files could be selected,
+    and several sources as a JSON list, so that no character of a path has to be kept as a separator.
+    """
+    return sources[0] if len(sources) == 1 else json.dumps(list(sources))
+
+def decode_link_sources(selection) -> list:
+    """Return the sources stored by encode_link_sources()."""
+    if selection.startswith("["):
+        try:
+            sources = json.loads(selection)
+        except ValueError:
+            #Path of a single file starting with '['
+            sources = None
+        if isinstance(sources, list) and sources != [] and all(isinstance(source, str) for source in sources):
+            return sources
+    return [selection]
+
+def get_link_files(selection) -> list:
+    """Return the text files selected in the GUI, stored by encode_link_sources()."""
+    return expand_link_sources(decode_link_sources(selection))
+
+def collect_links_from_files(target_files, filters, match_all=True, ignore_dashes=False, dedupe=False) -> list:
+    """
+    Return the list of links to open from several files, in the order of the files and then of the lines in each file.
+
+    Filters are applied to every file on its own, so line ranges count lines from the start of each file,
+    and a file shorter than a range only has the lines it has matched.
+    The files are read in parallel by a process pool if together they are larger than PARALLEL_READ_MIN_BYTES.
+    If dedupe is True, duplicates are removed after the links of all files have been merged, 
+    so that a page linked to in several files is only opened once.
+    """
+    if len(target_files) == 1:
+        return collect_links(target_files[0], filters, match_all, ignore_dashes, dedupe)
+    filters = tuple(filters)
+    workers = min(len(target_files), os.cpu_count() or 1)
+    if workers > 1 and sum(os.path.getsize(target_file) for target_file in target_files) > PARALLEL_READ_MIN_BYTES:
+        #Processes are spawned rather than forked, as a forked process would inherit locks held by other threads, such as link_cache_lock
+        context = multiprocessing.get_context("spawn")
+        with metrics.phase("collect_links"), concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            #Results are returned in the order of the files, whichever process finishes first
+            file_links = list(executor.map(collect_links, target_files, itertools.repeat(filters), itertools.repeat(match_all),
+                                           itertools.repeat(ignore_dashes), itertools.repeat(False), itertools.repeat(False)))
+    else:
+        file_links = [collect_links(target_file, filters, match_all, ignore_dashes, False, False) for target_file in target_files]
+    links = itertools.chain.from_iterable(file_links)
+    if not dedupe:
+        return list(links)
+    link_count = sum(map(len, file_links))
+    use_bloom_filter = link_count > int(config.get("USERCONFIG", "dedupe_bloom_threshold"))
+    deduplicator = LinkDeduplicator(link_count if use_bloom_filter else 0)
+    links = LinkList(deduplicator.filter(links))
+    links.duplicates = deduplicator.duplicates
+    return links
+
+def number_links(target_file, links, filters, match_all=True, ignore_dashes=False):
+    """
+    Generate a (line number, link) tuple for every link collected from a file by collect_links() with the same filters.
+
+    Line numbers of links selected from a LinkTable are looked up in the table. Otherwise the file is read again 
+    and every link is matched to the next line passing the filters with the same URL and comment, 
+    as the links are in the order of the lines they were read from.
+    """
+    if isinstance(links, LinkView):
+        line_numbers = links.table.line_numbers
+        yield from zip((line_numbers[index] for index in links.indices), links)
+        return
+    links = iter(links)
+    link = next(links, None)
+    predicate = compile_filters(filters, match_all, ignore_dashes)
+    for line_number, line in enumerate(read_file(target_file), 1):
+        if link is None:
+            return
+        if len(line) > 0 and predicate(line_number, line) and next(strip_dashes_from_links([line])) == link:
+            yield line_number, link
+            link = next(links, None)
+
+def generate_export_rows(target_files, filters, match_all=True, ignore_dashes=False, dedupe=False, line_numbers=False):
+    """
+    Generate a (file, line number, link) tuple for every link collect_links_from_files() returns for the files.
+
+    The links of one file are collected at a time, so that only the links of a single file are kept in memory.
+    Line numbers are None unless line_numbers is True.
+    """
+    filters = tuple(filters)
+    deduplicator = None
+    if dedupe and len(target_files) > 1:
+        #Duplicates are removed across all files, the same way as collect_links_from_files() does
+        deduplicator = LinkDeduplicator(sum(estimate_file_lines(target_file) for target_file in target_files), 
+                                        int(config.get("USERCONFIG", "dedupe_bloom_threshold")))
+    for target_file in target_files:
+        links = collect_links(target_file, filters, match_all, ignore_dashes, dedupe and deduplicator is None, len(target_files) == 1)
+        if line_numbers:
+            numbered_links = number_links(target_file, links, filters, match_all, ignore_dashes)
+        else:
+            numbered_links = zip(itertools.repeat(None), links)
+        for line_number, link in numbered_links:
+            if deduplicator is None or not deduplicator.is_duplicate(link[0]):
+                yield target_file, line_number, link
+
+def get_export_format(export_file, format=None) -> str:
+    """Return format if given, otherwise the export format for the extension of export_file (plain text if unknown)."""
+    if format is not None:
+        return format
+    return EXPORT_FORMATS.get(os.path.splitext(export_file)[1].lower(), "txt")
+
+def get_export_fields(row, comments=False, line_numbers=False) -> dict:
+    """Return the values of a row from generate_export_rows() to export by their field names, in the order they are written."""
+    target_file, line_number, link = row
+    fields = {"file": target_file, "line": line_number} if line_numbers else {}
+    fields["url"] = link[0]
+    if comments:
+        fields["comment"] = link[1] if len(link) == 2 else None
+    return fields
+
+def write_export_rows(file, rows, format="txt", comments=False, line_numbers=False) -> int:
+    """
+    Write rows from generate_export_rows() to a text file object and return the number of rows written.
+
+    Plain text has one URL per line, with its comment after a tab and the file and line number before it 
+    ('file:line' and a tab) if they are included. CSV has a header row and a column for every included field,
+    and JSON Lines has one object per link. Rows are formatted and written EXPORT_BATCH_SIZE at a time.
+    """
+    if format == "csv":
+        import csv
+        writer = csv.writer(file)
+        writer.writerow((["file", "line"] if line_numbers else []) + ["url"] + (["comment"] if comments else []))
+    count = 0
+    while True:
+        batch = [get_export_fields(row, comments, line_numbers) for row in itertools.islice(rows, EXPORT_BATCH_SIZE)]
+        if batch == []:
+            return count
+        count += len(batch)
+        match format:
+            case "csv":
+                #Empty comments are written as empty strings
+                writer.writerows(fields.values() for fields in batch)
+            case "jsonl":
+                file.write("".join(json.dumps(fields) + "\n" for fields in batch))
+            case _:
+                file.write("".join((f"{fields['file']}:{fields['line']}\t" if line_numbers else "") + fields["url"]
+                                   + (f"\t{fields['comment']}" if fields.get("comment") is not None else "") + "\n"
+                                   for fields in batch))
+
+def export_links(target_files, export_file, filters, match_all=True, ignore_dashes=False, dedupe=False, 
+                 format=None, comments=False, line_numbers=False) -> int:
+    """
+    Write the links collect_links_from_files() returns for the files to export_file instead of opening them,
+    or to standard output if export_file is '-', and return the number of links written.
+
+    The format is chosen by get_export_format(). The first file is read before export_file is created, 
+    so that a file which can not be read or an invalid line range leaves no empty export file behind.
+    Raise the same errors as collect_links(), and OSError if export_file can not be written.
+    """
+    format = get_export_format(export_file, format)
+    with metrics.phase("export"):
+        rows = generate_export_rows(target_files, filters, match_all, ignore_dashes, dedupe, line_numbers)
+        rows = itertools.chain(list(itertools.islice(rows, 1)), rows)
+        if export_file == "-":
+            count = write_export_rows(sys.stdout, rows, format, comments, line_numbers)
+            sys.stdout.flush()
+        else:
+            with open(export_file, "w", encoding="utf-8", newline="" if format == "csv" else None, buffering=EXPORT_BUFFER_SIZE) as file:
+                count = write_export_rows(file, rows, format, comments, line_numbers)
+    metrics.count("links_exported", count)
+    return count
+
+class FileFollower:
+    """
+    Follow a file which is being appended to and return the links in lines added since it was last checked.
+
+    Only the bytes after the last complete line read are read on every check, and a check of a file
+    whose size and modification time have not changed costs a single stat call.
+    Lines are formatted by parse_line() and numbered from the start of the file, so that all filters work as usual.
+    If the file becomes smaller than what has been read, it has been replaced and is read again from the start.
+    """
+    def __init__(self, target_file, filters=(), match_all=True, ignore_dashes=False, dedupe=False, from_start=False):
+        self.target_file = target_file
+        self.predicate = compile_filters(tuple(filters), match_all, ignore_dashes)
+        self.deduplicator = LinkDeduplicator() if dedupe else None
+        #Decodes the same way as update_word_index()
+        self.encoding = locale.getpreferredencoding(False)
+        self.offset = 0
+        self.line_count = 0
+        self.file_stat = None
+        if not from_start:
+            if self.deduplicator is None:
+                #Skips the lines already in the file without formatting them
+                self.file_stat = self.get_file_stat()
+                for line_number, raw_line in self.read_new_lines():
+                    pass
+            else:
+                #Links already in the file still count as seen when looking for duplicates
+                self.poll()
+
+    def get_file_stat(self):
+        """Return the (size, modification time) of the file, or None if it does not exist right now."""
+        try:
+            file_stat = os.stat(self.target_file)
+        except FileNotFoundError:
+            return None
+        return (file_stat.st_size, file_stat.st_mtime_ns)
+
+    def read_new_lines(self):
+        """Yield (line number, line as bytes) for every complete line after the last one read."""
+        with open(self.target_file, "rb") as file:
+            file.seek(self.offset)
+            #Last line is read once it has been finished
+            for raw_line in read_raw_lines(file, complete_only=True):
+                self.offset += len(raw_line)
+                self.line_count += 1
+                yield self.line_count, raw_line
+
+    def poll(self) -> list:
+        """Return the links in the lines added since the last check which pass the filters."""
+        file_stat = self.get_file_stat()
+        if file_stat is None or file_stat == self.file_stat:
+            return []
+        self.file_stat = file_stat
+        if file_stat[0] < self.offset:
+            #File has been truncated or replaced
+            self.offset, self.line_count = 0, 0
+        lines = ((line_number, parse_line(raw_line.decode(self.encoding, errors="replace")))
+                 for line_number, raw_line in self.read_new_lines())
+        links = select_numbered_links(lines, self.predicate)
+        if self.deduplicator is not None:
+            links = self.deduplicator.filter(links)
+        return list(links)
+
+def filter_narrows(filtertype, previous_value, filtervalue) -> bool:
+    """
+    Return True if every line passing a filter with filtervalue also passes the same filter with previous_value.
+
+    A phrase or URL part which is extended while it is typed only matches lines the shorter value matched.
+    """
+    if filtertype == "Phrase":
+        return previous_value.lower() in filtervalue.lower()
+    if filtertype == "Domain" and parse_domain_query(previous_value) is None:
+        #Every URL on a domain contains the domain name
+        domain_query = parse_domain_query(filtervalue)
+        return previous_value.lower() in (filtervalue.lower() if domain_query is None else domain_query[0])
+    return previous_value == filtervalue
+
+class FilterPreview:
+    """
+    Find the lines of files passing a filter while the filter is being typed.
+
+    run() is meant to be called on a worker thread and gives up as soon as a newer query has been started with start().
+    When a phrase or URL filter is extended, only the lines which passed the previous query are checked again.
+    The LinkTables of the files are kept in the link cache, so that they count towards its limit, 
+    except for files too large for it, whose tables are kept by the preview so that no keystroke reads them again.
+    A file is read by one query at a time, and a query giving up leaves the part it has read for the next one.
+    """
+    def __init__(self):
+        self.generation = 0
+        self.lock = threading.Lock()
+        self.load_lock = threading.Lock()
+        #LinkTables of the files too large for the link cache, by cache key
+        self.large_tables = {}
+        #Partly read LinkTables and iterators of the lines left to read, by cache key
+        self.partial_tables = {}
+        #Query and matching row indices of every table of the last finished query
+        self.last_query = None
+        self.last_results = []
+
+    def start(self) -> int:
+        """Start a new query, making every running query give up, and return its generation for run()."""
+        self.generation += 1
+        return self.generation
+
+    def is_current(self, generation) -> bool:
+        """Return True if no newer query has been started."""
+        return generation == self.generation
+
+    def load_tables(self, generation, target_files) -> tuple:
+        """
+        Return the cache keys and the LinkTables of the files, reading only the files which are not stored,
+        or None if a newer query was started before the files were read.
+        """
+        keys = [get_cache_key(target_file, None) for target_file in target_files]
+        with self.load_lock:
+            #Tables of files which are no longer selected or have changed are dropped
+            self.large_tables = {key: table for key, table in self.large_tables.items() if key in keys}
+            self.partial_tables = {key: partial for key, partial in self.partial_tables.items() if key in keys}
+            tables = []
+            for target_file, key in zip(target_files, keys):
+                table = self.large_tables.get(key) or get_cached_link_table(target_file)
+                if table is None:
+                    table = self.read_table(generation, target_file, key)
+                    if table is None:
+                        return None
+                tables.append(table)
+        return keys, tables
+
+    def read_table(self, generation, target_file, key):
+        """Read the rest of a file into its LinkTable and store it, or return None if a newer query was started first."""
+        table, lines = self.partial_tables.pop(key, None) or (
+            LinkTable(), metrics.timed("read_file", enumerate(read_file(target_file), 1), "lines_read"))
+        while True:
+            read_count = 0
+            for line_number, line in itertools.islice(lines, PREVIEW_CHUNK_SIZE):
+                read_count += 1
+                if len(line) > 0:
+                    table.append(line_number, line)
+            if read_count < PREVIEW_CHUNK_SIZE:
+                break
+            if not self.is_current(generation):
+                self.partial_tables[key] = (table, lines)
+                return None
+        if len(table) > LINK_CACHE_MAX_LINES:
+            self.large_tables[key] = table
+            return table
+        return get_cached_links(target_file, None, lambda: table)
+
+    def run(self, generation, target_files, filtertype, filtervalue, ignore_dashes=False):
+        """
+        Return a tuple of the number of lines passing the filter and the first PREVIEW_MATCHES of them as links,
+        or None if a newer query was started before this one finished.
+        """
+        loaded = self.load_tables(generation, target_files)
+        if loaded is None:
+            return None
+        keys, tables = loaded
+        query = (keys, filtertype, ignore_dashes)
+        previous_results = [None] * len(tables)
+        if self.last_query is not None and self.last_query[0] == query and filter_narrows(filtertype, self.last_query[1], filtervalue):
+            previous_results = self.last_results
+        predicate = compile_filters([(filtertype, filtervalue)], True, ignore_dashes)
+        results = []
+        for table, previous in zip(tables, previous_results):
+            rows = table.get_rows(previous)
+            selected = array.array("I")
+            for start in range(0, len(rows), PREVIEW_CHUNK_SIZE):
+                if not self.is_current(generation):
+                    return None
+                selected.extend(table.select(predicate, rows[start:start + PREVIEW_CHUNK_SIZE]))
+            results.append(selected)
+        with self.lock:
+            if not self.is_current(generation):
+                return None
+            self.last_query, self.last_results = (query, filtervalue), results
+        first_links = itertools.islice(itertools.chain.from_iterable(LinkView(table, selected) for table, selected in zip(tables, results)),
+                                       PREVIEW_MATCHES)
+        return sum(map(len, results)), list(first_links)
+
+def describe_filter(filtertype, filtervalue) -> str:
+    """Return a short description of a single filter."""
+    match filtertype:
+        case "Phrase":
+            return f"comment '{filtervalue}'"
+        case "Domain":
+            return f"URL '{filtervalue}'"
+        case "Words":
+            return f"comment words '{filtervalue}'"
+        case "Keywords":
+            keywords = filtervalue.split("\n")
+            return f"{len(keywords)} keywords"
+        case "Regex":
+            return f"URL pattern '{filtervalue}'"
+        case "Lines":
+            start, end = filtervalue.split(",")
+            return f"lines {start}-{end}"
+    return filtervalue
 
 def add_browser_path():
     """Save selected browser path and name to config.ini."""
+    #tkinter is only imported when the GUI is used
+    from tkinter import filedialog
     filename = filedialog.askopenfilename(initialdir="/", title="Select File", 
                                          filetypes=[("Executable file (*.exe)", "*.exe"), ("All Files", "*.*")])
     get_browsername = filename.split("/")
@@ -174,12 +2142,13 @@ def add_browser_path():
     #Takes only the filename of the full path of the file and then splits it by the file extension (.)
     if filename != "":
         #Writes the name of the file selected to [BROWSER_PATHS] in config.ini as well as its full path
-        config.set("BROWSER_PATHS", browsername[0], filename)
+        set_config_value("BROWSER_PATHS", browsername[0], filename)
         write_config()
 
 def remove_browser(browser):
     """Remove selected browser path entry from config.ini."""
-    config.remove_option("BROWSER_PATHS", browser)
+    if config.remove_option("BROWSER_PATHS", browser):
+        changed_config_keys.add(("BROWSER_PATHS", browser))
     write_config()
 
 def get_browser_list() -> list:
@@ -191,18 +2160,477 @@ def get_browser_list() -> list:
         #Return the name of all browsers added in [BROWSER_PATHS] in config.ini
         return [option.title() for option in config['BROWSER_PATHS']]
 
+def describe_skipped_links(link_list) -> str:
+    """Return a description of how many duplicate, already opened and dead links were removed from the list, if any."""
+    skipped = []
+    if getattr(link_list, "duplicates", 0) > 0:
+        skipped.append(f"{link_list.duplicates} duplicate")
+    if getattr(link_list, "already_opened", 0) > 0:
+        skipped.append(f"{link_list.already_opened} already opened")
+    if getattr(link_list, "dead", 0) > 0:
+        skipped.append(f"{link_list.dead} dead")
+    if len(skipped) > 2:
+        skipped = [", ".join(skipped[:-1]), skipped[-1]]
+    return f" ({' and '.join(skipped)} links skipped)" if skipped != [] else ""
+
+def describe_flagged_links(link_list) -> str:
+    """Return a description of how many links in the list look dead but are opened anyway, if any."""
+    return f", {link_list.flagged} of which look dead" if getattr(link_list, "flagged", 0) > 0 else ""
+
+def get_no_match_message(filters) -> str:
+    """Return the error message shown when no lines in a file pass the filters, or when a file has no links without filters."""
+    if len(filters) == 0:
+        return "No links to open in file!"
+    if len(filters) == 1 and filters[0][0] == "Phrase":
+        return f"No comment phrase '{filters[0][1]}' in file!"
+    if len(filters) == 1 and filters[0][0] == "Domain":
+        return f"No URL containing '{filters[0][1]}' in file!"
+    if len(filters) == 1 and filters[0][0] == "Regex":
+        return f"No URL matching '{filters[0][1]}' in file!"
+    return "No lines in file pass the set filters!"
+
+def get_browser_controller(browser):
+    """Return the webbrowser controller for a browser in [BROWSER_PATHS]."""
+    return webbrowser.get(config.get("BROWSER_PATHS", browser) + " %s")
+
+def get_link_launcher(browser, links_per_launch=1):
+    """
+    Return a function which opens a list of URLs in browser from [BROWSER_PATHS].
+
+    If links_per_launch is greater than 1, the browser is started once with all URLs as arguments, 
+    which most browsers open as separate tabs. Otherwise every URL is opened on its own.
+    browser can also be a webbrowser controller, which opens every URL on its own.
+    Raise webbrowser.Error if the browser can not be started.
+    """
+    if isinstance(browser, webbrowser.BaseBrowser) or links_per_launch <= 1:
+        controller = browser if isinstance(browser, webbrowser.BaseBrowser) else get_browser_controller(browser)
+        def launch_links(urls):
+            for url in urls:
+                controller.open_new_tab(url)
+        return launch_links
+    browser_path = config.get("BROWSER_PATHS", browser)
+    def launch_links(urls):
+        try:
+            subprocess.Popen([browser_path, *urls])
+        except OSError as e:
+            raise webbrowser.Error(str(e))
+    return launch_links
+
+class LinkScheduler:
+    """
+    Decide when the links of a batch are opened.
+
+    A token bucket limits the rate of browser launches: one launch is allowed every delay milliseconds, 
+    and up to burst launches can be saved up and made right after each other.
+    If host_delay is greater than 0, links on the same host are opened at least host_delay milliseconds apart, 
+    and the hosts take turns so that links on other hosts are opened in the meantime.
+    Otherwise links are opened in the order of the list.
+    """
+    def __init__(self, link_list, delay, burst=1, host_delay=0, clock=time.monotonic):
+        self.interval = delay / 1000
+        self.burst = max(1, burst)
+        self.host_delay = host_delay / 1000
+        self.clock = clock
+        self.tokens = self.burst
+        self.refilled_at = clock()
+        #Links waiting to be opened for every host, in the order the hosts take turns
+        self.queues = OrderedDict()
+        for link in link_list:
+            host = get_link_host(link[0]) if self.host_delay > 0 else None
+            self.queues.setdefault(host, deque()).append(link)
+        #Earliest time the next link on every host can be opened
+        self.host_ready = {}
+
+    def __len__(self):
+        return sum(len(queue) for queue in self.queues.values())
+
+    def refill(self, now):
+        """Add the launches allowed since the last refill to the bucket."""
+        if self.interval == 0:
+            self.tokens = self.burst
+        else:
+            self.tokens = min(self.burst, self.tokens + (now - self.refilled_at) / self.interval)
+        self.refilled_at = now
+
+    def next_links(self, limit=1) -> tuple:
+        """
+        Take the links which can be opened in one browser launch right now.
+
+        Return a tuple of a list of at most limit links and the number of seconds to wait before calling again.
+        """
+        now = self.clock()
+        self.refill(now)
+        links = []
+        if self.tokens >= 1:
+            for host in list(self.queues):
+                if len(links) >= limit:
+                    break
+                if self.host_ready.get(host, 0) > now:
+                    #Skips hosts which have had a link opened too recently
+                    continue
+                queue = self.queues.pop(host)
+                #Only one link per host is taken if links on the same host have to be spread out
+                take = 1 if self.host_delay > 0 else limit - len(links)
+                links.extend(queue.popleft() for _ in range(min(take, len(queue))))
+                self.host_ready[host] = now + self.host_delay
+                if queue:
+                    #Host goes to the back of the line
+                    self.queues[host] = queue
+            if links != []:
+                self.tokens -= 1
+        return links, self.get_wait(now)
+
+    def get_wait(self, now) -> float:
+        """Return the number of seconds until more links can be opened."""
+        if len(self.queues) == 0:
+            return 0
+        token_wait = 0 if self.tokens >= 1 else (1 - self.tokens) * self.interval
+        host_wait = min(max(0, self.host_ready.get(host, 0) - now) for host in self.queues)
+        return max(token_wait, host_wait)
+
+def open_links_in_browser(link_list, browser, delay, links_per_launch=1, burst=1, host_delay=0, on_launch=None):
+    """
+    Open all links provided in list in browser from [BROWSER_PATHS].
+
+    Pass links_per_launch links to the browser at a time, at the pace set by LinkScheduler.
+    on_launch is called with the URLs of every launch after the browser has been started.
+    """
+    launch_links = get_link_launcher(browser, links_per_launch)
+    scheduler = LinkScheduler(link_list, delay, burst, host_delay)
+    while len(scheduler) > 0:
+        links, wait = scheduler.next_links(max(1, links_per_launch))
+        if links != []:
+            launch_start = time.perf_counter()
+            launch_links([link[0] for link in links])
+            if metrics.enabled:
+                metrics.observe_launch(time.perf_counter() - launch_start, len(links))
+            if on_launch is not None:
+                on_launch([link[0] for link in links])
+        if wait > 0:
+            time.sleep(wait)
+
+def parse_arguments(args):
+    """Return the command line arguments for opening links without the GUI."""
+    parser = argparse.ArgumentParser(description="Open links from a text file without starting the GUI. " 
+                                     "Settings not given as arguments are read from config.ini.")
+    parser.add_argument("--file", required=True, action="extend", nargs="+", 
+                        help="text files, directories of .txt files or glob patterns to read links from")
+    parser.add_argument("--phrase", action="append", default=[], help="only open lines whose comment contains PHRASE")
+    parser.add_argument("--words", action="append", default=[], 
+                        help="only open lines whose comment contains every word in WORDS (a word ending with '*' matches by prefix)")
+    parser.add_argument("--keywords", action="append", default=[], 
+                        help="only open lines whose comment contains any of the '|' separated KEYWORDS")
+    parser.add_argument("--keyword-file", action="append", default=[], 
+                        help="only open lines whose comment contains any keyword in KEYWORD_FILE (one keyword per line)")
+    parser.add_argument("--domain", action="append", default=[], 
+                        help="only open lines whose URL is on DOMAIN or its subdomains (or contains DOMAIN if it is not a domain name)")
+    parser.add_argument("--regex", action="append", default=[], help="only open lines whose URL matches the regular expression REGEX")
+    parser.add_argument("--lines", action="append", default=[], metavar="START,END", help="only open lines in range")
+    parser.add_argument("--match", choices=["all", "any"], default="all", 
+                        help="open lines passing all filters or any filter (default: all)")
+    parser.add_argument("--browser", help="name of browser in [BROWSER_PATHS] (default: first browser added)")
+    parser.add_argument("--delay", type=int, help="delay between opening links in milliseconds")
+    parser.add_argument("--links-per-launch", type=int, help="number of links passed to the browser every time it is started")
+    parser.add_argument("--burst", type=int, help="number of browser launches allowed right after each other before the delay applies")
+    parser.add_argument("--host-delay", type=int, help="minimum delay between opening links on the same host in milliseconds")
+    parser.add_argument("--ignore-dashes", action=argparse.BooleanOptionalAction, default=None,
+                        help="skip links ending with '--'")
+    parser.add_argument("--dedupe", action=argparse.BooleanOptionalAction, default=None,
+                        help="skip links leading to the same page as an earlier link")
+    parser.add_argument("--resume", action=argparse.BooleanOptionalAction, default=None,
+                        help="skip links already opened by an unfinished run with the same links")
+    parser.add_argument("--skip-opened", action=argparse.BooleanOptionalAction, default=None,
+                        help="skip links which have been opened before in any run")
+    parser.add_argument("--check-links", choices=["off", "flag", "drop"], 
+                        help="check if links lead to a page before opening them, and warn about (flag) or skip (drop) dead links")
+    parser.add_argument("--check-timeout", type=int, help="time to wait for a server to answer when checking a link in milliseconds")
+    parser.add_argument("--yes", action="store_true", help="do not ask before opening more than batch_warning links")
+    parser.add_argument("--follow", action="store_true", 
+                        help="keep watching the file and open the links of lines added to it from now on, until stopped with Ctrl+C")
+    parser.add_argument("--follow-interval", type=int, help="delay between checking the file for new lines in milliseconds")
+    parser.add_argument("--export", metavar="EXPORT_FILE", 
+                        help="write the links to EXPORT_FILE ('-' for standard output) instead of opening them")
+    parser.add_argument("--export-format", choices=["txt", "csv", "jsonl"], 
+                        help="format of EXPORT_FILE (default: chosen by its extension, plain text if unknown)")
+    parser.add_argument("--export-comments", action=argparse.BooleanOptionalAction, default=None,
+                        help="add the comment of every link to EXPORT_FILE")
+    parser.add_argument("--export-line-numbers", action=argparse.BooleanOptionalAction, default=None,
+                        help="add the file and line number of every link to EXPORT_FILE")
+    parser.add_argument("--metrics", metavar="METRICS_FILE", 
+                        help="write phase timings and browser launch latencies to METRICS_FILE ('-' for standard output)")
+    parser.add_argument("--metrics-format", choices=["json", "prometheus"], help="format of METRICS_FILE (default: json)")
+    return parser.parse_args(args)
+
+def get_cli_filters(arguments) -> list:
+    """
+    Return the (filter type, filter value) tuples set by the command line arguments.
+
+    Keyword lists without any keywords are left out, the same way as in the GUI.
+    Raise OSError or UnicodeDecodeError if a keyword file can not be read.
+    """
+    filters = [("Phrase", phrase.lower()) for phrase in arguments.phrase]
+    filters += [("Words", words) for words in arguments.words]
+    keyword_lists = [keywords.split("|") for keywords in arguments.keywords]
+    keyword_lists += [read_keyword_file(keyword_file) for keyword_file in arguments.keyword_file]
+    for keywords in keyword_lists:
+        keywords = [keyword.strip().lower() for keyword in keywords if keyword.strip() != ""]
+        if keywords != []:
+            #Use "\n" as a delimiter between keywords
+            filters.append(("Keywords", "\n".join(keywords)))
+    filters += [("Domain", domain) for domain in arguments.domain]
+    filters += [("Regex", pattern) for pattern in arguments.regex]
+    filters += [("Lines", line_range) for line_range in arguments.lines]
+    return filters
+
+def run_cli(args) -> int:
+    """
+    Open links from a text file without the GUI.
+
+    Use the same filters and config.ini settings as the GUI. Return the exit code of the program.
+    """
+    arguments = parse_arguments(args)
+    metrics_file = arguments.metrics if arguments.metrics is not None else config.get("USERCONFIG", "metrics_file")
+    metrics.enabled = metrics_file != ""
+    exit_code = open_cli_links(arguments)
+    if metrics.enabled:
+        try:
+            metrics.export(metrics_file, arguments.metrics_format or config.get("USERCONFIG", "metrics_format"))
+        except OSError:
+            print(f"Error: Metrics could not be written to '{metrics_file}'!", file=sys.stderr)
+            return exit_code or 1
+    return exit_code
+
+def open_cli_links(arguments) -> int:
+    """Open the links selected by the command line arguments and return the exit code for run_cli()."""
+    try:
+        filters = get_cli_filters(arguments)
+    except (OSError, UnicodeDecodeError):
+        print("Error: Keyword file can not be read! Select a valid text file.", file=sys.stderr)
+        return 1
+    ignore_dashes = arguments.ignore_dashes
+    if ignore_dashes is None:
+        ignore_dashes = config.get("USERCONFIG", "ignore_dashes") == "True"
+    dedupe = arguments.dedupe
+    if dedupe is None:
+        dedupe = config.get("USERCONFIG", "dedupe") == "True"
+    delay = arguments.delay if arguments.delay is not None else int(config.get("USERCONFIG", "delay"))
+    links_per_launch = arguments.links_per_launch if arguments.links_per_launch is not None else int(config.get("USERCONFIG", "links_per_launch"))
+    burst = arguments.burst if arguments.burst is not None else int(config.get("USERCONFIG", "burst"))
+    host_delay = arguments.host_delay if arguments.host_delay is not None else int(config.get("USERCONFIG", "host_delay"))
+    for filtertype, filtervalue in filters:
+        if filtertype == "Words" and parse_word_query(filtervalue) == (set(), ()):
+            print(f"Error: Whole words filter '{filtervalue}' must contain at least one word!", file=sys.stderr)
+            return 1
+    error_msg = "Error: Range values must be valid line numbers in file!"
+    try:
+        for filtertype, filtervalue in filters:
+            if filtertype == "Lines":
+                parse_line_range(filtervalue)
+    except (IndexError, ValueError):
+        print(error_msg, file=sys.stderr)
+        return 1
+    try:
+        for filtertype, filtervalue in filters:
+            if filtertype == "Regex":
+                compile_link_pattern(filtervalue)
+    except re.error as error:
+        print(f"Error: Invalid regular expression '{error.pattern}': {error}!", file=sys.stderr)
+        return 1
+    try:
+        target_files = expand_link_sources(arguments.file)
+    except FileNotFoundError as error:
+        print(f"Error: {error}!", file=sys.stderr)
+        return 1
+    if arguments.export is not None:
+        return export_cli_links(arguments, target_files, filters, ignore_dashes, dedupe)
+    browser = arguments.browser or get_browser_list()[0]
+    if browser == "No Browser Added":
+        print("Error: Must add a path to a browser first!", file=sys.stderr)
+        return 1
+    if not config.has_option("BROWSER_PATHS", browser):
+        print(f"Error: Browser '{browser}' has not been added to config.ini!", file=sys.stderr)
+        return 1
+    if arguments.follow:
+        if len(target_files) > 1:
+            print("Error: Only a single file can be followed!", file=sys.stderr)
+            return 1
+        return follow_cli_links(arguments, target_files[0], filters, ignore_dashes, dedupe, 
+                                lambda link_list, on_launch: open_links_in_browser(link_list, browser, delay, links_per_launch, 
+                                                                                   burst, host_delay, on_launch))
+    try:
+        link_list = collect_links_from_files(target_files, filters, arguments.match == "all", ignore_dashes, dedupe)
+    except IndexError:
+        print(error_msg, file=sys.stderr)
+        return 1
+    except (OSError, UnicodeDecodeError):
+        print("Error: Target file can not be read! Select a valid text file.", file=sys.stderr)
+        return 1
+    if link_list == []:
+        print(f"Error: {get_no_match_message(filters)}", file=sys.stderr)
+        return 1
+    resume = arguments.resume if arguments.resume is not None else config.get("USERCONFIG", "resume_batches") == "True"
+    skip_opened = arguments.skip_opened if arguments.skip_opened is not None else config.get("USERCONFIG", "skip_opened") == "True"
+    history = LinkHistory()
+    with metrics.phase("batch_warning"):
+        batch_key = history.get_batch_key(link_list)
+        link_list = history.remove_opened(link_list, resume, skip_opened)
+    try:
+        link_list = check_cli_links(arguments, link_list)
+    except (OSError, sqlite3.Error) as error:
+        print(f"Error: Links could not be checked! {error}", file=sys.stderr)
+        return 1
+    if describe_skipped_links(link_list) != "":
+        print(describe_skipped_links(link_list).strip(" ()"), file=sys.stderr)
+    if link_list == []:
+        print("All links left to open are dead!" if getattr(link_list, "dead", 0) > 0 else "All links have already been opened!", 
+              file=sys.stderr)
+        return 0
+    confirmed = confirm_cli_batch(arguments, link_list)
+    if not confirmed:
+        return 1 if confirmed is None else 0
+    history.start_batch(batch_key, len(link_list))
+    try:
+        with metrics.phase("dispatch"):
+            open_links_in_browser(link_list, browser, delay, links_per_launch, burst, host_delay, history.record_opened)
+    except webbrowser.Error:
+        print(f"Error: Browser '{browser}' could not be opened! Check its path in config.ini.", file=sys.stderr)
+        return 1
+    history.finish_batch(batch_key)
+    history.close()
+    return 0
+
+def check_cli_links(arguments, link_list):
+    """
+    Check the links if --check-links or check_links in config.ini is not 'off', print every dead link 
+    and return the links left to open.
+
+    Raise OSError or sqlite3.Error if the links can not be checked.
+    """
+    check_mode = arguments.check_links or config.get("USERCONFIG", "check_links")
+    if check_mode == "off" or link_list == []:
+        return link_list
+    with metrics.phase("check_links"):
+        link_list, dead_links = check_links(link_list, get_link_checker(arguments.check_timeout), check_mode == "drop", 
+                                            print_check_progress if sys.stderr.isatty() else None)
+    for url, status, detail in dead_links:
+        print(f"{'Skipped' if check_mode == 'drop' else 'Dead'} link: {describe_dead_link(url, status, detail)}", file=sys.stderr)
+    return link_list
+
+def confirm_cli_batch(arguments, link_list):
+    """
+    Return True if the links should be opened, asking first if there are at least batch_warning of them, or False if declined.
+
+    Return None, after printing why, if they could only be opened with --yes as there is no terminal to ask on.
+    """
+    batch_warning = int(config.get("USERCONFIG", "batch_warning"))
+    if len(link_list) < batch_warning or batch_warning == 0 or arguments.yes:
+        return True
+    if not sys.stdin.isatty():
+        print(f"Error: About to open {len(link_list)} links{describe_flagged_links(link_list)}. Run again with --yes to proceed.", 
+              file=sys.stderr)
+        return None
+    answer = input(f"You are about to open {len(link_list)} links{describe_flagged_links(link_list)}. Proceed? [y/N] ")
+    return answer.strip().lower() in ("y", "yes")
+
+def print_check_progress(checked, total):
+    """Show how many links have been checked on the terminal, on a single line."""
+    print(f"\rChecking links: {checked}/{total}", end="\n" if checked == total else "", file=sys.stderr, flush=True)
+
+def export_cli_links(arguments, target_files, filters, ignore_dashes, dedupe) -> int:
+    """Write the links selected by the command line arguments to the export file instead of opening them, and return the exit code."""
+    comments = arguments.export_comments
+    if comments is None:
+        comments = config.get("USERCONFIG", "export_comments") == "True"
+    line_numbers = arguments.export_line_numbers
+    if line_numbers is None:
+        line_numbers = config.get("USERCONFIG", "export_line_numbers") == "True"
+    try:
+        count = export_links(target_files, arguments.export, filters, arguments.match == "all", ignore_dashes, dedupe, 
+                             arguments.export_format, comments, line_numbers)
+    except IndexError:
+        print("Error: Range values must be valid line numbers in file!", file=sys.stderr)
+        return 1
+    except UnicodeDecodeError:
+        print("Error: Target file can not be read! Select a valid text file.", file=sys.stderr)
+        return 1
+    except OSError as error:
+        print(f"Error: Links could not be exported! {error}", file=sys.stderr)
+        return 1
+    print(f"Exported {count} links" + (f" to {arguments.export}" if arguments.export != "-" else ""), file=sys.stderr)
+    return 0
+
+def follow_cli_links(arguments, target_file, filters, ignore_dashes, dedupe, open_link_list) -> int:
+    """
+    Open the links of lines added to target_file until stopped with Ctrl+C.
+
+    New links are checked and confirmed the same way as the links opened before following the file.
+    open_link_list is called with the new links and the function recording them in the history.
+    Return the exit code for run_cli().
+    """
+    skip_opened = arguments.skip_opened if arguments.skip_opened is not None else config.get("USERCONFIG", "skip_opened") == "True"
+    follow_interval = arguments.follow_interval if arguments.follow_interval is not None else int(config.get("USERCONFIG", "follow_interval"))
+    try:
+        if get_compression(target_file) is not None:
+            print("Error: Compressed files can not be followed!", file=sys.stderr)
+            return 1
+        follower = FileFollower(target_file, filters, arguments.match == "all", ignore_dashes, dedupe)
+    except OSError:
+        print("Error: Target file can not be read! Select a valid text file.", file=sys.stderr)
+        return 1
+    history = LinkHistory()
+    print(f"Following {target_file} for new links. Press Ctrl+C to stop.", file=sys.stderr)
+    try:
+        while True:
+            link_list = history.remove_opened(follower.poll(), resume=False, skip_opened=skip_opened)
+            try:
+                link_list = check_cli_links(arguments, link_list)
+            except (OSError, sqlite3.Error) as error:
+                print(f"Error: Links could not be checked! {error}", file=sys.stderr)
+                return 1
+            if link_list != []:
+                confirmed = confirm_cli_batch(arguments, link_list)
+                if confirmed is None:
+                    return 1
+                if confirmed:
+                    open_link_list(link_list, history.record_opened)
+                else:
+                    print(f"Skipped {len(link_list)} new links", file=sys.stderr)
+            time.sleep(follow_interval / 1000)
+    except KeyboardInterrupt:
+        return 0
+    except webbrowser.Error:
+        print("Error: Browser could not be opened! Check its path in config.ini.", file=sys.stderr)
+        return 1
+    finally:
+        history.close()
+
 def main():
     """Construct the GUI for the application."""
+    #tkinter is only imported when the GUI is used
+    import tkinter as tk
+    from tkinter import BooleanVar, StringVar, filedialog, messagebox, Label, Frame, Button, Entry, Checkbutton, OptionMenu
+    from tkinter.simpledialog import askstring
+    global config_write_scheduler
+
     root = tk.Tk()
     root.title("Open Links From Text File")
 
+    #Changes to config.ini are written together once no change has been made for CONFIG_WRITE_DELAY milliseconds
+    config_write_job = []
+    def schedule_config_write():
+        """Write config.ini after CONFIG_WRITE_DELAY milliseconds, replacing any earlier scheduled write."""
+        if config_write_job != []:
+            root.after_cancel(config_write_job.pop())
+        config_write_job.append(root.after(CONFIG_WRITE_DELAY, flush_config))
+    config_write_scheduler = schedule_config_write
+
     # Add Icon to Window if Icon file exists
     if os.path.exists(ICON_FILE_NAME):
         root.iconphoto(False, tk.PhotoImage(file=ICON_FILE_NAME))
 
-    #Create 600x300 unresizable GUI roughly in the middle of the screen (60px north of center)
-    w = 600
-    h = 300
+    #Create 800x420 unresizable GUI roughly in the middle of the screen (60px north of center)
+    w = 800
+    h = 420
     ws = root.winfo_screenwidth()
     hs = root.winfo_screenheight()
     x = (ws/2) - (w/2) - 0
@@ -211,28 +2639,55 @@ def main():
     root.resizable(width=False, height=False)
     
     #Lines separating sections of the GUI
-    select_file_frame = Frame(height=207, width=410, highlightbackground="black", highlightthickness=1)
+    select_file_frame = Frame(height=237, width=410, highlightbackground="black", highlightthickness=1)
     select_file_frame.place(x=-1, y=-1)
-    settings_frame = Frame(height=98, width=602, highlightbackground="black", highlightthickness=1)
-    settings_frame.place(x=-1, y=203)
+    settings_frame = Frame(height=188, width=802, highlightbackground="black", highlightthickness=1)
+    settings_frame.place(x=-1, y=233)
 
+    #Path of the selected file or folder, or paths of several selected files stored by encode_link_sources()
     selected_file = StringVar()
     selected_file.set("No File Selected")
-    selected_file_label = Label(textvariable=selected_file, fg="#0066ff")
+    selected_file_description = StringVar()
+    selected_file_label = Label(textvariable=selected_file_description, fg="#0066ff")
     selected_file_label.place(x=8, y=46)
 
+    def describe_selected_file(*args):
+        """Show the selected file or folder, or how many files have been selected."""
+        selection = decode_link_sources(selected_file.get())
+        if len(selection) == 1:
+            selected_file_description.set(selection[0])
+        else:
+            selected_file_description.set(f"{len(selection)} files selected in {os.path.dirname(selection[0])}")
+    selected_file.trace_add("write", describe_selected_file)
+    describe_selected_file()
+
     def select_file():
-        """Let user select text file from system and store its path as a variable."""
-        filename = filedialog.askopenfilename(initialdir=config.get("USERCONFIG", "defaultdir"), title="Select File", 
-                                                    filetypes=[("Text Documents (*.txt)", "*.txt"), ("All Files", "*.*")])
-        #If filedialog box gets cancelled, "" is returned
-        if filename != "":
+        """Let user select one or more text files from system and store their paths as a variable."""
+        filenames = filedialog.askopenfilenames(initialdir=config.get("USERCONFIG", "defaultdir"), title="Select File", 
+                                                filetypes=[("Text Documents (*.txt)", "*.txt"), 
+                                                           ("Compressed Text Documents", LINK_FILE_PATTERNS[1:]), ("All Files", "*.*")])
+        #If filedialog box gets cancelled, an empty tuple is returned
+        if len(filenames) > 0:
             if open_txt_check.get() is True:
-                #Opens text file in systems default program if checkbox is checked
-                open_file_in_default_editor(filename)
-            selected_file.set(filename)
-
-    select_file_button = Button(text="Select Text File", command=select_file, font="arial 13 bold", bg="#1b76ff", fg="#fefefe")
+                #Opens text files in systems default program if checkbox is checked
+                for filename in filenames:
+                    open_file_in_default_editor(filename)
+            selected_file.set(encode_link_sources(filenames))
+
+    def select_folder():
+        """Let user select a folder from system, to read every text file directly inside it."""
+        folder = filedialog.askdirectory(initialdir=config.get("USERCONFIG", "defaultdir"), title="Select Folder")
+        #If filedialog box gets cancelled, an empty string is returned
+        if folder:
+            selected_file.set(folder)
+
+    #Menu shown under the select button to choose between selecting files and a folder
+    select_source_menu = tk.Menu(root, tearoff=0)
+    select_source_menu.add_command(label="Select Text Files...", command=select_file)
+    select_source_menu.add_command(label="Select Folder...", command=select_folder)
+    select_file_button = Button(text="Select Text File", font="arial 13 bold", bg="#1b76ff", fg="#fefefe", 
+                                command=lambda: select_source_menu.tk_popup(select_file_button.winfo_rootx(), 
+                                                                            select_file_button.winfo_rooty() + select_file_button.winfo_height()))
     select_file_button.place(x=8, y=10)
 
     select_filter_label = Label(text="Filter:", font="arial 13 bold")
@@ -245,10 +2700,12 @@ def main():
 
     filter_phrase_label = Label(text="Open all lines containing comment phrase:")
     filter_phrase_label.place(x=8, y=115)
-    filter_domain_label = Label(text="Open all lines containing URL:")
+    filter_domain_label = Label(text="Open all lines containing URL/domain:")
     filter_domain_label.place(x=8, y=145)
     filter_line_label = Label(text="Open all lines in range (Start/End):")
     filter_line_label.place(x=8, y=175)
+    filter_keyword_label = Label(text="Open all lines containing a keyword from file:")
+    filter_keyword_label.place(x=8, y=205)
 
     set_phrase_filter = Entry(width=20)
     set_phrase_filter.place(x=243, y=116)
@@ -256,6 +2713,8 @@ def main():
     set_phrase_filter_button.place(x=373, y=113) 
     #Bind set_phrase_filter entry field to set_phrase_filter_button command when pressing enter
     set_phrase_filter.bind('<Return>', (lambda event: apply_phrase_filter(set_phrase_filter.get()))) 
+    #Preview the lines matching the phrase while it is typed
+    set_phrase_filter.bind('<KeyRelease>', (lambda event: schedule_preview(lambda: get_phrase_filter(set_phrase_filter.get()))), add="+")
 
     set_domain_filter = Entry(width=20)
     set_domain_filter.place(x=243, y=146)
@@ -263,6 +2722,71 @@ def main():
     set_domain_filter_button.place(x=373, y=143)
     #Bind set_domain_filter entry field to set_domain_filter_button command when pressing enter
     set_domain_filter.bind('<Return>', (lambda event: apply_domain_filter(set_domain_filter.get())))
+    #Preview the lines matching the URL phrase while it is typed
+    set_domain_filter.bind('<KeyRelease>', (lambda event: schedule_preview(lambda: get_domain_filter(set_domain_filter.get()))), add="+")
+
+    #Panel showing how many lines pass the filter being typed, found on a worker thread so that typing is never held up
+    filter_preview = FilterPreview()
+    preview_job = []
+    preview_frame = Frame(height=237, width=192, highlightbackground="black", highlightthickness=1)
+    preview_frame.place(x=599, y=-1)
+    preview_title_label = Label(text="Filter Preview:", font="arial 13 bold")
+    preview_title_label.place(x=605, y=8)
+    preview_text = StringVar()
+    preview_text.set("Type a comment phrase or URL\nto see the lines it matches.")
+    preview_label = Label(textvariable=preview_text, fg="#0066ff", justify=tk.LEFT, anchor="nw", wraplength=180)
+    preview_label.place(x=605, y=36)
+
+    def schedule_preview(get_entry_filter):
+        """Preview the filter being typed once no key has been pressed for PREVIEW_DELAY milliseconds."""
+        if preview_job != []:
+            root.after_cancel(preview_job.pop())
+        preview_job.append(root.after(PREVIEW_DELAY, lambda: start_preview(get_entry_filter)))
+
+    def start_preview(get_entry_filter):
+        """Start finding the lines passing the filter being typed on a worker thread, superseding any running preview."""
+        preview_job.clear()
+        generation = filter_preview.start()
+        try:
+            entry_filter = get_entry_filter()
+        except re.error as error:
+            preview_text.set(f"Invalid regular expression:\n{error}")
+            return
+        if entry_filter is None or selected_file.get() == "No File Selected":
+            preview_text.set("")
+            return
+        try:
+            target_files = get_link_files(selected_file.get())
+        except FileNotFoundError:
+            preview_text.set("Target file can not be read!")
+            return
+        result = {}
+        ignore_dashes = ignore_dash_check.get()
+        def run_preview():
+            try:
+                result["matches"] = filter_preview.run(generation, target_files, *entry_filter, ignore_dashes)
+            except (OSError, UnicodeDecodeError):
+                result["error"] = "Target file can not be read!"
+            except Exception as error:
+                #Shows the error instead of leaving the preview searching forever
+                result["error"] = f"Preview failed:\n{error}"
+        threading.Thread(target=run_preview, daemon=True).start()
+        preview_text.set("Searching...")
+        root.after(50, show_preview, generation, result)
+
+    def show_preview(generation, result):
+        """Show the result of a preview once its worker thread has finished, unless a newer preview has been started."""
+        if not filter_preview.is_current(generation):
+            return
+        if "error" in result:
+            preview_text.set(result["error"])
+        elif result.get("matches") is None:
+            #Checks again until the worker thread has finished
+            root.after(50, show_preview, generation, result)
+        else:
+            match_count, first_links = result["matches"]
+            lines = [f"{match_count} matching lines"] + [link[0] if len(link[0]) <= 30 else link[0][:29] + "\u2026" for link in first_links]
+            preview_text.set("\n".join(lines))
 
     set_line_filter_start = Entry(width=5)
     set_line_filter_end = Entry(width=5)
@@ -275,44 +2799,135 @@ def main():
     #Bind set_line_filter_enter entry field to set_line_filter_button command when pressing enter
     set_line_filter_end.bind('<Return>', (lambda event: apply_line_filter(set_line_filter_start.get(), set_line_filter_end.get())))
 
+    set_keyword_filter_button = Button(text="Select Keyword File", command=lambda:[select_keyword_file()])
+    set_keyword_filter_button.place(x=273, y=203)
+
+    def get_phrase_filter(phrase):
+        """
+        Return the (filter type, filter value) tuple of a phrase, or None if the phrase is empty
+        or has no words while 'Whole words' is ticked.
+
+        Phrases separated by "|" are a single filter matching any of the phrases.
+        """
+        if "|" in phrase:
+            return get_keyword_filter(phrase.split("|"))
+        if phrase == "":
+            return None
+        if whole_words_check.get() is True:
+            return ("Words", phrase) if parse_word_query(phrase) != (set(), ()) else None
+        return ("Phrase", phrase)
+
     def apply_phrase_filter(phrase):
-        """Set the filter to only include lines which comments contain specific phrase."""
-        if phrase != "":
-            current_filter.set(f"Open only lines containing comment: '{phrase}'")
-            current_filter_type.set("Phrase")
-            current_filter_value.set(phrase)
-            clear_filter_entries()
+        """Add a filter to only include lines which comments contain specific phrase."""
+        phrase_filter = get_phrase_filter(phrase)
+        if phrase_filter is not None:
+            add_filter(*phrase_filter)
+        elif "|" not in phrase and phrase.strip() != "" and whole_words_check.get() is True:
+            messagebox.showerror("Error", "Whole words filter must contain at least one word!")
+
+    def get_keyword_filter(keywords):
+        """Return the (filter type, filter value) tuple of a list of keywords, or None if every keyword is empty."""
+        keywords = [keyword.strip().lower() for keyword in keywords if keyword.strip() != ""]
+        #Use "\n" as a delimiter between keywords
+        return ("Keywords", "\n".join(keywords)) if keywords != [] else None
+
+    def apply_keyword_filter(keywords):
+        """Add a filter to only include lines which comments contain any of the keywords."""
+        keyword_filter = get_keyword_filter(keywords)
+        if keyword_filter is not None:
+            add_filter(*keyword_filter)
+
+    def select_keyword_file():
+        """Let user select text file with one keyword per line and add a filter for its keywords."""
+        filename = filedialog.askopenfilename(initialdir=config.get("USERCONFIG", "defaultdir"), title="Select Keyword File", 
+                                              filetypes=[("Text Documents (*.txt)", "*.txt"), ("All Files", "*.*")])
+        if filename != "":
+            try:
+                apply_keyword_filter(read_keyword_file(filename))
+            except (OSError, UnicodeDecodeError):
+                messagebox.showerror("Error", "Keyword file can not be read! Select a valid text file.")
+
+    def get_domain_filter(domain):
+        """
+        Return the (filter type, filter value) tuple of a URL phrase, or None if the phrase is empty.
+
+        A phrase starting with '~' is a regular expression the URL has to match. Raise re.error if it is not valid.
+        """
+        if domain.startswith("~") and len(domain) > 1:
+            compile_link_pattern(domain[1:])
+            return ("Regex", domain[1:])
+        return ("Domain", domain) if domain != "" else None
 
     def apply_domain_filter(domain):
-        """Set the filter to only include lines which URL contain specific phrase."""
-        if domain != "":
-            current_filter.set(f"Open only lines containing URL: '{domain}'")
-            current_filter_type.set("Domain")
-            current_filter_value.set(domain)
-            clear_filter_entries()
+        """Add a filter to only include lines which URL contain specific phrase."""
+        try:
+            domain_filter = get_domain_filter(domain)
+        except re.error as error:
+            messagebox.showerror("Error", f"Invalid regular expression: {error}")
+            return
+        if domain_filter is not None:
+            add_filter(*domain_filter)
 
     def apply_line_filter(start, end):
-        """Set the filter to only include lines of a specific index range."""
+        """Add a filter to only include lines of a specific index range."""
         if start != "" and end != "":
-            current_filter.set(f"Open everything from line {start} to line {end}")
-            current_filter_type.set("Lines")
             #Use "," as a delimiter between start value and end value
-            current_filter_value.set(str(start)+","+str(end))   
-            clear_filter_entries()
+            add_filter("Lines", str(start)+","+str(end))
+
+    #Stores every filter that has been set as a (filter type, filter value) tuple
+    #Filter type is either comment phrase, link phrase or index range
+    active_filters = []
+
+    #Determines if lines have to pass all set filters or only one of them
+    filter_match = StringVar()
+    filter_match.set("Match All")
+    filter_match_menu = OptionMenu(root, filter_match, "Match All", "Match Any", command=lambda _:[update_filter_label()])
+    filter_match_menu.configure(font="arial 8")
+    filter_match_menu.place(x=215, y=60)
+
+    #Checkbox to match whole words in comments instead of any part of the comment when setting a comment phrase filter
+    whole_words_check = BooleanVar()
+    whole_words_check.set(False)
+    whole_words_checkbox = Checkbutton(text="Whole words", variable=whole_words_check, onvalue=True, offvalue=False)
+    whole_words_checkbox.place(x=300, y=62)
+
+    def add_filter(filtertype, filtervalue):
+        """Add filter to the set filters and combine it with the filters already set."""
+        active_filters.append((filtertype, filtervalue))
+        update_filter_label()
+        clear_filter_entries()
 
-    #Determines which type of filter (Comment phrase, link phrase or index range)
-    current_filter_type = StringVar()  
-    #Stores the actual value to be filtered 
-    current_filter_value = StringVar()  
+    def update_filter_label():
+        """Show a description of the set filters in GUI."""
+        if len(active_filters) == 0:
+            current_filter.set("Open All Lines In Document (No Filter Set)")
+        elif len(active_filters) == 1:
+            filtertype, filtervalue = active_filters[0]
+            match filtertype:
+                case "Phrase":
+                    current_filter.set(f"Open only lines containing comment: '{filtervalue}'")
+                case "Domain":
+                    current_filter.set(f"Open only lines containing URL: '{filtervalue}'")
+                case "Words":
+                    current_filter.set(f"Open only lines containing words: '{filtervalue}'")
+                case "Keywords":
+                    current_filter.set(f"Open only lines containing any of {describe_filter(filtertype, filtervalue)}")
+                case "Regex":
+                    current_filter.set(f"Open only lines with URL matching: '{filtervalue}'")
+                case "Lines":
+                    start, end = filtervalue.split(",")
+                    current_filter.set(f"Open everything from line {start} to line {end}")
+        else:
+            joiner = " AND " if filter_match.get() == "Match All" else " OR "
+            current_filter.set(joiner.join(describe_filter(filtertype, filtervalue) for filtertype, filtervalue in active_filters))
 
     reset_filter_button = Button(text="Reset Filter", command=lambda:[reset_filter()])
     reset_filter_button.place(x=332, y=83)
     
     def reset_filter():
-        """Remove the currently set filter."""
-        current_filter.set("Open All Lines In Document (No Filter Set)")
-        current_filter_type.set("")
-        current_filter_value.set("")
+        """Remove all filters that have been set."""
+        active_filters.clear()
+        update_filter_label()
         clear_filter_entries()
 
     def clear_filter_entries():
@@ -325,6 +2940,9 @@ def main():
         set_line_filter_start.insert(0, "")
         set_line_filter_end.delete(0, tk.END)
         set_line_filter_end.insert(0, "")
+        #Stops any running preview of the cleared entries
+        filter_preview.start()
+        preview_text.set("")
     
     open_links_button = Button(text="Open Links", command=lambda:[check_if_file_selected()], font="arial 13 bold", bg="#3eda46", fg="#fefefe", width=17)
     open_links_button.place(x=415, y=8)
@@ -367,102 +2985,322 @@ def main():
         Validate if filter is legitimate.
 
         Show error if filter is not valid.
-        Generate new list from selected file based of filter settings if filter has been set and is valid.
+        Generate new list from selected files based on all filters that have been set, evaluated in a single pass over every file.
         Execute check_batch_warning() function if no issues found. 
         """
-        filtertype, filtervalue = current_filter_type.get(), current_filter_value.get()
-        file = read_file(selected_file.get())
-        if filtertype and filtervalue != "":
-            match filtertype:
-                case "Phrase":
-                    #Filter to include only lines containing comment phrase
-                    try:
-                        if filter_by_phrase(file, filtervalue) != []:
-                            #Proceed if no issues
-                            check_batch_warning(filter_by_phrase(file, filtervalue))
-                        else:
-                            #Do not proceed if specific comment phrase was not found in file
-                            messagebox.showerror("Error", f"No comment phrase '{filtervalue}' in file!")
-                    except Exception as e:
-                        #Might be useless
-                        messagebox.showerror("Error", e)
-                case "Domain":
-                    #Filter to include only lines containing domain phrase
-                    try:
-                        if filter_by_domain(file, filtervalue) != []:
-                            #Proceed if no issues
-                            check_batch_warning(filter_by_domain(file, filtervalue))
-                        else:
-                            #Do not proceed if specific domain phrase was not found in file
-                            messagebox.showerror("Error", f"No URL containing '{filtervalue}' in file!")
-                    except Exception as e:
-                        #Might be useless
-                        messagebox.showerror("Error", e)
-                case "Lines":
-                    #Filter to include only lines in specific index range
-                    #Start and end value is split by "," delimiter
-                    line_index = filtervalue.split(",")
-                    error_msg = "Range values must be valid line numbers in file!"
-                    try:
-                        if int(line_index[0]) > int(line_index[1]):
-                            #Do not proceed if start index is greater than end index     
-                            messagebox.showerror("Error", error_msg)
-                            return
-                        if int(line_index[0]) < 1 or int(line_index[1]) < 1:
-                            #Do not proceed if start or end index is 0 or below
-                            messagebox.showerror("Error", error_msg)
-                            return
-                        #Proceed if no issues
-                        check_batch_warning(filter_by_lines(file, int(line_index[0]), int(line_index[1])))  
-                    except IndexError:
-                        #Catches out of bounds indices
-                        messagebox.showerror("Error", error_msg)
-                    except ValueError:
-                        #Catches non-integer values
-                        messagebox.showerror("Error", error_msg)
-        else:
-            #Proceed to open whole file if no filter set
-            check_batch_warning(file)        
+        target_files = get_link_files(selected_file.get())
+        filters = tuple(active_filters)
+        error_msg = "Range values must be valid line numbers in file!"
+        try:
+            for filtertype, filtervalue in filters:
+                if filtertype == "Lines":
+                    parse_line_range(filtervalue)
+        except (IndexError, ValueError):
+            #Catches non-integer values, start index greater than end index and indices of 0 or below
+            messagebox.showerror("Error", error_msg)
+            return
+        try:
+            #Created before the file is read so that no line added while the batch is opened is missed
+            dispatch["follower"] = None
+            if follow_check.get():
+                if len(target_files) > 1:
+                    messagebox.showerror("Error", "Only a single file can be followed for new links!")
+                    return
+                if get_compression(target_files[0]) is not None:
+                    messagebox.showerror("Error", "Compressed files can not be followed for new links!")
+                    return
+                dispatch["follower"] = FileFollower(target_files[0], filters, filter_match.get() == "Match All", 
+                                                    ignore_dash_check.get(), dedupe_check.get())
+            link_list = collect_links_from_files(target_files, filters, filter_match.get() == "Match All", ignore_dash_check.get(), dedupe_check.get())
+        except IndexError:
+            #Catches out of bounds indices
+            messagebox.showerror("Error", error_msg)
+            return
+        if link_list == [] and dispatch["follower"] is None:
+            #Do not proceed if no links are left after filtering the file, unless waiting for new lines
+            messagebox.showerror("Error", get_no_match_message(filters))
+            return
+        #Proceed if no issues
+        check_batch_warning(link_list)
+
+    def export_links_to_file():
+        """
+        Write the links passing all filters to a file selected by the user instead of opening them.
+
+        The format is chosen by the extension of the file, and comments and line numbers are added
+        if export_comments and export_line_numbers are turned on in config.ini.
+        """
+        if selected_file.get() == "No File Selected":
+            messagebox.showerror("Error", "Must select a text file to read from first!")
+            return
+        filters = tuple(active_filters)
+        error_msg = "Range values must be valid line numbers in file!"
+        try:
+            for filtertype, filtervalue in filters:
+                if filtertype == "Lines":
+                    parse_line_range(filtervalue)
+        except (IndexError, ValueError):
+            messagebox.showerror("Error", error_msg)
+            return
+        export_file = filedialog.asksaveasfilename(initialdir=config.get("USERCONFIG", "defaultdir"), title="Export Links", 
+                                                   defaultextension=".txt", 
+                                                   filetypes=[("Text Documents (*.txt)", "*.txt"), ("CSV Files (*.csv)", "*.csv"), 
+                                                              ("JSON Lines Files (*.jsonl)", "*.jsonl")])
+        if export_file == "":
+            return
+        try:
+            count = export_links(get_link_files(selected_file.get()), export_file, filters, filter_match.get() == "Match All", 
+                                 ignore_dash_check.get(), dedupe_check.get(), None,
+                                 config.get("USERCONFIG", "export_comments") == "True", 
+                                 config.get("USERCONFIG", "export_line_numbers") == "True")
+        except IndexError:
+            messagebox.showerror("Error", error_msg)
+            return
+        except UnicodeDecodeError:
+            messagebox.showerror("Error", "Target file can not be read! Select a valid text file.")
+            return
+        except OSError as error:
+            messagebox.showerror("Error", f"Links could not be exported! {error}")
+            return
+        messagebox.showinfo("Info", f"Exported {count} links to {export_file}")
+
+    export_links_button = Button(text="Export Links", command=lambda:[export_links_to_file()])
+    export_links_button.place(x=605, y=203)
 
     def check_batch_warning(link_list):
-        """Warn user if number of links set to be opened is greater than batch_warning in settings."""
-        if [] in link_list:
-            #Remove all items containing empty lines
-            link_list.remove([])
-        if ignore_dash_check.get() is True:
-            #Removes all links ending with '--' if checkbox is checked
-            link_list = filter_ignored_links(link_list)
-        else:
-            #Removes double dashes from the end of the links
-            link_list = strip_dashes_from_links(link_list)      
+        """
+        Warn user if number of links set to be opened is greater than batch_warning in settings.
+
+        Links already opened by an unfinished batch or before are removed first, depending on settings.
+        """
+        with metrics.phase("batch_warning"):
+            dispatch["batch_key"] = link_history.get_batch_key(link_list)
+            link_list = link_history.remove_opened(link_list, resume_check.get(), skip_opened_check.get())
+        if link_list == [] and dispatch["follower"] is None:
+            messagebox.showinfo("Info", "All links have already been opened!")
+            return
+        check_mode = get_check_mode()
+        if check_mode != "off" and link_list != []:
+            start_link_check(link_list, check_mode == "drop", confirm_checked_batch)
+            return
+        confirm_batch(link_list)
+
+    def start_link_check(link_list, drop, on_checked):
+        """
+        Check if the links lead to a page on a worker thread, so that the GUI stays responsive, 
+        and then call on_checked with the links left to open, or None if they could not be checked.
+        """
+        result = {}
+        progress = {"checked": 0, "total": len(link_list)}
+        def run_check():
+            try:
+                with metrics.phase("check_links"):
+                    result["links"] = check_links(link_list, get_link_checker(), drop, 
+                                                  lambda checked, total: progress.update(checked=checked, total=total))
+            except Exception as error:
+                #Any error is shown, as the button to open links stays disabled until the check has finished
+                result["error"] = str(error) or type(error).__name__
+        #Stops another batch from being started while the links are checked
+        open_links_button.config(state=tk.DISABLED)
+        threading.Thread(target=run_check, daemon=True).start()
+        root.after(100, show_link_check, result, progress, on_checked)
+
+    def show_link_check(result, progress, on_checked):
+        """Show how many links have been checked until the check has finished, then pass the links left to on_checked."""
+        if "links" not in result and "error" not in result:
+            dispatch_progress.set(f"Checking links: {progress['checked']}/{progress['total']}")
+            root.after(100, show_link_check, result, progress, on_checked)
+            return
+        open_links_button.config(state=tk.NORMAL)
+        dispatch_progress.set("")
+        if "error" in result:
+            messagebox.showerror("Error", f"Links could not be checked! {result['error']}")
+            on_checked(None)
+            return
+        link_list, dead_links = result["links"]
+        on_checked(link_list)
+
+    def confirm_checked_batch(link_list):
+        """Confirm the batch of links left after checking them, unless they could not be checked or all of them are dead."""
+        if link_list is None:
+            return
+        if link_list == [] and dispatch["follower"] is None:
+            messagebox.showinfo("Info", "All links left to open are dead!")
+            return
+        confirm_batch(link_list)
+
+    def ask_batch_warning(link_list) -> bool:
+        """Return True if the links should be opened, asking the user first if there are at least batch_warning of them or if any of them look dead."""
         batch_warning = int(config.get("USERCONFIG", "batch_warning"))
-        if len(link_list) >= batch_warning and batch_warning != 0:
-            #Send warning if number of links is greater than user setting
-            msgbox_warning = messagebox.askquestion("Warning", f"You are about to open {len(link_list)} links. Proceed?")
-            if msgbox_warning == "yes":
-                #Proceed if user clicks yes
-                open_links(link_list)
-        else:
-            #Proceed if number is lower than batch_warning or if batch_warning is set to 0
+        if (len(link_list) >= batch_warning and batch_warning != 0) or getattr(link_list, "flagged", 0) > 0:
+            #Send warning if number of links is greater than user setting or if any links look dead
+            msgbox_warning = messagebox.askquestion("Warning", f"You are about to open {len(link_list)} links{describe_skipped_links(link_list)}"
+                                                    f"{describe_flagged_links(link_list)}. Proceed?")
+            #Proceed if user clicks yes
+            return msgbox_warning == "yes"
+        #Proceed if number is lower than batch_warning or if batch_warning is set to 0
+        return True
+
+    def confirm_batch(link_list):
+        """Open the links if the user does not decline the batch warning."""
+        if ask_batch_warning(link_list):
             open_links(link_list)
 
+    #Links of the batch being opened and how far the batch has come
+    dispatch = {"links": [], "batch_key": None, "scheduler": None, "position": 0, "links_per_launch": 1, "launch_links": None, 
+                "job": None, "paused": False, "active_time": 0.0, "resumed_at": 0.0, "follower": None, "checking": None}
+    #Every opened link is recorded so that unfinished batches can be resumed
+    link_history = LinkHistory()
+    #Phase timings and launch latencies are only measured if metrics_file is set in config.ini
+    metrics.enabled = config.get("USERCONFIG", "metrics_file") != ""
+
+    pause_button = Button(text="Pause", command=lambda:[toggle_pause()], font="arial 13 bold", width=7)
+    cancel_button = Button(text="Cancel", command=lambda:[cancel_links()], font="arial 13 bold", bg="#ff4b4b", fg="#fefefe", width=7)
+    dispatch_progress = StringVar()
+    dispatch_progress_label = Label(textvariable=dispatch_progress, fg="#0066ff")
+    dispatch_progress_label.place(x=415, y=208)
+
     def open_links(link_list):
         """
-        Open all links provided in list in selected browser.
-        
-        Close application if autoclose_checkbox has been ticked.
+        Start opening all links provided in list in selected browser.
+
+        Links are opened a few at a time by open_next_link() so that the GUI stays responsive while the batch is opened.
         """
-        browser = config.get("BROWSER_PATHS", browser_selection.get()) + " %s"
-        #Converts milliseconds to seconds
-        delay = int(config.get("USERCONFIG", "delay"))/1000     
-        for link in link_list:
-            webbrowser.get(browser).open_new_tab(link[0])
-            #Adds delay between every link being opened
-            time.sleep(delay)       
-        if close_check.get() is True:
-            #Closes application after links have been opened if autoclose_checkbox has been ticked
-            #Saves any changes made to checkboxes before closing application
-            check_checkboxes()      
+        links_per_launch = int(config.get("USERCONFIG", "links_per_launch"))
+        dispatch["links"], dispatch["position"], dispatch["links_per_launch"] = link_list, 0, max(1, links_per_launch)
+        dispatch["scheduler"] = LinkScheduler(link_list, int(config.get("USERCONFIG", "delay")), 
+                                              int(config.get("USERCONFIG", "burst")), int(config.get("USERCONFIG", "host_delay")))
+        dispatch["launch_links"] = get_link_launcher(browser_selection.get(), links_per_launch)
+        dispatch["paused"], dispatch["active_time"], dispatch["resumed_at"] = False, 0.0, time.monotonic()
+        link_history.start_batch(dispatch["batch_key"], len(link_list))
+        #Replace Open Links button with Pause and Cancel buttons while the batch is opened
+        open_links_button.place_forget()
+        pause_button.config(text="Pause")
+        pause_button.place(x=415, y=8)
+        cancel_button.place(x=505, y=8)
+        open_next_link()
+
+    def open_next_link():
+        """
+        Open the next links of the batch in selected browser and schedule the links after them.
+
+        Close application after the last link if autoclose_checkbox has been ticked.
+        """
+        dispatch["job"] = None
+        if len(dispatch["scheduler"]) == 0:
+            if dispatch["batch_key"] is not None:
+                link_history.finish_batch(dispatch["batch_key"])
+                dispatch["batch_key"] = None
+            if dispatch["follower"] is not None:
+                #Keeps opening links added to the file until cancelled
+                follow_file()
+                return
+            finish_links("Opened")
+            if close_check.get() is True:
+                #Closes application after links have been opened if autoclose_checkbox has been ticked
+                #Saves any changes made to checkboxes before closing application
+                check_checkboxes()
+            return
+        links, wait = dispatch["scheduler"].next_links(dispatch["links_per_launch"])
+        try:
+            if links != []:
+                launch_start = time.perf_counter()
+                dispatch["launch_links"]([link[0] for link in links])
+                if metrics.enabled:
+                    metrics.observe_launch(time.perf_counter() - launch_start, len(links))
+                link_history.record_opened([link[0] for link in links])
+        except webbrowser.Error:
+            finish_links("Stopped at")
+            messagebox.showerror("Error", "Browser could not be opened! Check that the browser path is valid.")
+            return
+        dispatch["position"] += len(links)
+        update_progress()
+        #Waits until the scheduler allows the next launch
+        dispatch["job"] = root.after(int(wait * 1000), open_next_link)
+
+    def follow_file():
+        """
+        Open the links added to the selected file since it was last checked, or check it again after follow_interval.
+
+        New links are checked and confirmed the same way as the links of the batch.
+        """
+        follower = dispatch["follower"]
+        if dispatch["checking"] is follower:
+            #Following continues once the new links have been checked
+            return
+        link_list = link_history.remove_opened(follower.poll(), False, skip_opened_check.get())
+        check_mode = get_check_mode()
+        if check_mode != "off" and link_list != []:
+            dispatch["checking"] = follower
+            start_link_check(link_list, check_mode == "drop", lambda checked_list: continue_following(follower, checked_list))
+            return
+        continue_following(follower, link_list)
+
+    def continue_following(follower, link_list):
+        """Open the new links of the followed file unless the batch warning is declined, then keep following the file."""
+        dispatch["checking"] = None
+        if dispatch["follower"] is not follower:
+            #Batch was cancelled while the new links were checked
+            return
+        if link_list is None or (link_list != [] and not ask_batch_warning(link_list)):
+            link_list = []
+        if link_list == []:
+            dispatch_progress.set(f"{dispatch['position']} links, following file")
+            if not dispatch["paused"]:
+                dispatch["job"] = root.after(int(config.get("USERCONFIG", "follow_interval")), open_next_link)
+            return
+        dispatch["links"] = [*dispatch["links"], *link_list]
+        dispatch["scheduler"] = LinkScheduler(link_list, int(config.get("USERCONFIG", "delay")), 
+                                              int(config.get("USERCONFIG", "burst")), int(config.get("USERCONFIG", "host_delay")))
+        if dispatch["paused"]:
+            update_progress()
+        else:
+            open_next_link()
+
+    def update_progress():
+        """Show how many links of the batch have been opened and how many links are opened per second."""
+        active_time = dispatch["active_time"]
+        if not dispatch["paused"]:
+            active_time += time.monotonic() - dispatch["resumed_at"]
+        rate = dispatch["position"] / active_time if active_time > 0 else 0
+        status = " (Paused)" if dispatch["paused"] else ""
+        dispatch_progress.set(f"{dispatch['position']}/{len(dispatch['links'])} links ({rate:.1f}/s){status}")
+
+    def toggle_pause():
+        """Pause opening links, or continue opening links if paused."""
+        if dispatch["paused"]:
+            dispatch["paused"], dispatch["resumed_at"] = False, time.monotonic()
+            pause_button.config(text="Pause")
+            open_next_link()
+        else:
+            if dispatch["job"] is not None:
+                root.after_cancel(dispatch["job"])
+                dispatch["job"] = None
+            dispatch["paused"] = True
+            dispatch["active_time"] += time.monotonic() - dispatch["resumed_at"]
+            pause_button.config(text="Resume")
+            update_progress()
+
+    def cancel_links():
+        """Stop opening the remaining links of the batch."""
+        if dispatch["job"] is not None:
+            root.after_cancel(dispatch["job"])
+            dispatch["job"] = None
+        finish_links("Cancelled after")
+
+    def finish_links(result):
+        """Show the result of the batch and bring back the Open Links button."""
+        pause_button.place_forget()
+        cancel_button.place_forget()
+        open_links_button.place(x=415, y=8)
+        dispatch_progress.set(f"{result} {dispatch['position']}/{len(dispatch['links'])} links{describe_skipped_links(dispatch['links'])}")
+        dispatch["links"], dispatch["scheduler"], dispatch["launch_links"], dispatch["follower"] = [], None, None, None
+        if metrics.enabled:
+            #Metrics of every batch opened since the program was started
+            try:
+                metrics.export(config.get("USERCONFIG", "metrics_file"), config.get("USERCONFIG", "metrics_format"))
+            except OSError:
+                messagebox.showerror("Error", "Metrics could not be written! Check metrics_file in config.ini.")
 
     #Checkbox to open text file in default text editor if checked when selecting file
     open_txt_check = BooleanVar()
@@ -488,38 +3326,48 @@ def main():
 
     def helpwindow():
         """Show help window in GUI."""
-        messagebox.showinfo("Help", "Add the path to the browser you want to use by clicking the 'Add Browser Path' button and then locate the .exe file of the browser on your system. You can add multiple browsers and the paths will be stored in the 'config.ini' file.\n\nSelect a text file to read from. The script will open the first entry of every line up until the first space or tab. Everything after the space is considered as a comment. Empty lines are not considered an entry.\n\nSet a filter only open specific lines in the text document.\n\nIf the script fails to execute, the added browser is not valid.")
+        messagebox.showinfo("Help", "Add the path to the browser you want to use by clicking the 'Add Browser Path' button and then locate the .exe file of the browser on your system. You can add multiple browsers and the paths will be stored in the 'config.ini' file.\n\nSelect one or more text files, or a folder to read every text file in it, to read from. The script will open the first entry of every line up until the first space or tab. Everything after the space is considered as a comment. Empty lines are not considered an entry.\n\nSet a filter to only open specific lines in the text document. Tick 'Whole words' to only match complete words in comments, where a word ending with '*' matches any word starting with it. A domain, such as 'google.com', opens links on that domain and its subdomains, and '=www.google.com' only opens links on that exact host. Type '~' before a regular expression, such as '~/watch\\?v=', to open links matching it. Any other URL filter opens links containing it anywhere. Separate phrases with '|', or select a file with one keyword per line, to open lines containing any of them. Multiple filters can be set and combined with 'Match All' or 'Match Any'.\n\nSet 'Check links before opening' to find links which no longer lead to a page before they are opened, and either be warned about them or skip them.\n\nClick 'Export Links' to save the links passing the filters to a .txt, .csv or .jsonl file instead of opening them.\n\nIf the script fails to execute, the added browser is not valid.")
 
     help_button = Button(text="Help", command=helpwindow, font="arial 13 bold")
-    help_button.place(x=10, y=212)
+    help_button.place(x=10, y=242)
 
     #Show and allow user to change default directory where user selects text files
     defaultdir_get = StringVar()
     defaultdir_get.set("Default Directory: " + config.get("USERCONFIG", "defaultdir"))
     defaultdir_label = Label(textvariable=defaultdir_get)
-    defaultdir_label.place(x=155, y=210)
+    defaultdir_label.place(x=155, y=240)
     set_defaultdir_button = Button(text="Change", command=lambda:[set_default_dir()])
-    set_defaultdir_button.place(x=542, y=208)
+    set_defaultdir_button.place(x=542, y=238)
 
     #Show and allow user to change how many links can be opened without warning
     warning_label = Label(text="Warn before opening X amount of links (0 = No warning):")
-    warning_label.place(x=155, y=240)
+    warning_label.place(x=155, y=270)
     change_warning = Entry(width=5)
-    change_warning.place(x=500, y=241)
+    change_warning.place(x=500, y=271)
     change_warning.insert(0, config.get("USERCONFIG", "batch_warning"))
     change_warning.config(state = "readonly")
     set_warning_button = Button(text="Change", command=lambda:[show_input_box("batch_warning")])
-    set_warning_button.place(x=542, y=238)
+    set_warning_button.place(x=542, y=268)
 
     #Show and allow user to change the delay between opening links
     delay_label = Label(text="Delay between opening links (In milliseconds):")
-    delay_label.place(x=155, y=270)
+    delay_label.place(x=155, y=300)
     change_delay = Entry(width=5)
-    change_delay.place(x=500, y=271)
+    change_delay.place(x=500, y=301)
     change_delay.insert(0, config.get("USERCONFIG", "delay"))
     change_delay.config(state = "readonly")
     set_delay_button = Button(text="Change", command=lambda:[show_input_box("delay")])
-    set_delay_button.place(x=542, y=268)
+    set_delay_button.place(x=542, y=298)
+
+    #Show and allow user to change how many links are passed to the browser every time it is started
+    links_per_launch_label = Label(text="Links passed to browser per launch (1 = One at a time):")
+    links_per_launch_label.place(x=155, y=330)
+    change_links_per_launch = Entry(width=5)
+    change_links_per_launch.place(x=500, y=331)
+    change_links_per_launch.insert(0, config.get("USERCONFIG", "links_per_launch"))
+    change_links_per_launch.config(state = "readonly")
+    set_links_per_launch_button = Button(text="Change", command=lambda:[show_input_box("links_per_launch")])
+    set_links_per_launch_button.place(x=542, y=328)
 
     def show_input_box(variable):
         """Set value for specified config variable based on user input."""
@@ -532,7 +3380,7 @@ def main():
         """Set the default directory when selecting text file and save value in config.ini."""
         folder = filedialog.askdirectory(initialdir=config.get("USERCONFIG", "defaultdir"))
         if folder != "":
-            config.set("USERCONFIG", "defaultdir", folder)
+            set_config_value("USERCONFIG", "defaultdir", folder)
             write_config()
             defaultdir_get.set("Default Directory: " + config.get("USERCONFIG", "defaultdir"))       
 
@@ -547,23 +3395,70 @@ def main():
             open_txt_check.set(config.get("USERCONFIG", "opentxtfile"))
             save_txt_check.set(config.get("USERCONFIG", "savetxt"))
             ignore_dash_check.set(config.get("USERCONFIG", "ignore_dashes"))
+            dedupe_check.set(config.get("USERCONFIG", "dedupe"))
+            skip_opened_check.set(config.get("USERCONFIG", "skip_opened"))
+            resume_check.set(config.get("USERCONFIG", "resume_batches"))
+            follow_check.set(config.get("USERCONFIG", "follow_file"))
+            check_links_selection.set(check_modes.get(config.get("USERCONFIG", "check_links"), "Off"))
 
     restore_default_button = Button(text="Restore Default Settings", command=restore_default_warning)
-    restore_default_button.place(x=10, y=265)
+    restore_default_button.place(x=10, y=295)
+
+    #Checkbox to skip links leading to the same page as an earlier link
+    dedupe_check = BooleanVar()
+    dedupe_check.set(config.get("USERCONFIG", "dedupe"))
+    dedupe_checkbox = Checkbutton(text="Skip duplicate links", variable=dedupe_check, onvalue=True, offvalue=False)
+    dedupe_checkbox.place(x=7, y=327)
+
+    #Checkbox to skip links which have been opened before in any batch
+    skip_opened_check = BooleanVar()
+    skip_opened_check.set(config.get("USERCONFIG", "skip_opened"))
+    skip_opened_checkbox = Checkbutton(text="Skip opened links", variable=skip_opened_check, onvalue=True, offvalue=False)
+    skip_opened_checkbox.place(x=7, y=357)
+
+    #Checkbox to continue a batch which was not opened to the end instead of opening it from the start
+    resume_check = BooleanVar()
+    resume_check.set(config.get("USERCONFIG", "resume_batches"))
+    resume_checkbox = Checkbutton(text="Resume unfinished batches of the same links", variable=resume_check, onvalue=True, offvalue=False)
+    resume_checkbox.place(x=155, y=357)
+
+    #Dropdown menu to check if links lead to a page before opening them, and warn about or skip dead links
+    check_modes = {"off": "Off", "flag": "Warn about dead links", "drop": "Skip dead links"}
+    check_links_label = Label(text="Check links before opening:")
+    check_links_label.place(x=605, y=240)
+    check_links_selection = StringVar()
+    check_links_selection.set(check_modes.get(config.get("USERCONFIG", "check_links"), "Off"))
+    check_links_menu = OptionMenu(root, check_links_selection, *check_modes.values())
+    check_links_menu.configure(font="arial 8")
+    check_links_menu.place(x=603, y=262)
+
+    def get_check_mode() -> str:
+        """Return the check_links setting selected in the dropdown menu."""
+        return next(mode for mode, description in check_modes.items() if description == check_links_selection.get())
+
+    #Checkbox to keep opening links added to the file after the batch has been opened, until cancelled
+    follow_check = BooleanVar()
+    follow_check.set(config.get("USERCONFIG", "follow_file"))
+    follow_checkbox = Checkbutton(text="Keep opening new links added to the file", variable=follow_check, onvalue=True, offvalue=False)
+    follow_checkbox.place(x=7, y=387)
     
     def reset_variables():
         """Update values of config variables in GUI."""
         #Remove readonly
         change_delay.config(state = tk.NORMAL)
         change_warning.config(state = tk.NORMAL)    
+        change_links_per_launch.config(state = tk.NORMAL)
         #Update fields
         change_warning.delete(0, tk.END)
         change_delay.delete(0, tk.END)
+        change_links_per_launch.delete(0, tk.END)
         change_warning.insert(0, config.get("USERCONFIG", "batch_warning"))
         change_delay.insert(0, config.get("USERCONFIG", "delay"))
+        change_links_per_launch.insert(0, config.get("USERCONFIG", "links_per_launch"))
         #Set readonly again
         change_delay.config(state = "readonly")
         change_warning.config(state = "readonly")
+        change_links_per_launch.config(state = "readonly")
 
     #Checkbox to automatically close program after opening links
     close_check = BooleanVar()
@@ -581,6 +3476,16 @@ def main():
             set_str_variable("savetxt", save_txt_check.get())
         if config.get("USERCONFIG", "ignore_dashes") != ignore_dash_check.get():
             set_str_variable("ignore_dashes", ignore_dash_check.get())
+        if config.get("USERCONFIG", "dedupe") != dedupe_check.get():
+            set_str_variable("dedupe", dedupe_check.get())
+        if config.get("USERCONFIG", "skip_opened") != skip_opened_check.get():
+            set_str_variable("skip_opened", skip_opened_check.get())
+        if config.get("USERCONFIG", "resume_batches") != resume_check.get():
+            set_str_variable("resume_batches", resume_check.get())
+        if config.get("USERCONFIG", "follow_file") != follow_check.get():
+            set_str_variable("follow_file", follow_check.get())
+        if config.get("USERCONFIG", "check_links") != get_check_mode():
+            set_str_variable("check_links", get_check_mode())
         close()
 
     browser_label = Label(text="Open In Browser:", font="arial 13 bold")
@@ -612,6 +3517,9 @@ def main():
             set_str_variable("savedtxtpath", selected_file.get())
         else:
             set_str_variable("savedtxtpath", "No File Selected")
+        #Writes all changes to config.ini at once before closing
+        flush_config()
+        link_history.close()
         root.destroy()
 
     #Update checkboxes before closing application.
@@ -620,4 +3528,7 @@ def main():
     root.mainloop()
     
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        #Runs without the GUI if any command line arguments are given
+        sys.exit(run_cli(sys.argv[1:]))
     main()
\ No newline at end of file
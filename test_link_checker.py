@@ -0,0 +1,129 @@
+import http.server
+import os
+import socket
+import tempfile
+import threading
+import unittest
+import urllib.parse
+
+import link_opener
+
+
+class LinkHandler(http.server.BaseHTTPRequestHandler):
+    """Answer the paths requested by the tests the way a web server would, counting the requests and connections it gets."""
+    protocol_version = "HTTP/1.1"
+    requests = []
+    connections = []
+
+    def setup(self):
+        super().setup()
+        LinkHandler.connections.append(self.client_address)
+
+    def log_message(self, format, *args):
+        pass
+
+    def respond(self, send_body):
+        LinkHandler.requests.append((self.command, self.path))
+        location = None
+        if self.path == "/ok" or urllib.parse.unquote(self.path) == "/straße?q=café":
+            status = 200
+        elif self.path == "/redirect":
+            status, location = 301, "/ok"
+        elif self.path == "/no-head":
+            #Server which only allows GET requests
+            status = 405 if self.command == "HEAD" else 200
+        else:
+            status = 404
+        body = b"page"
+        self.send_response(status)
+        if location is not None:
+            self.send_header("Location", location)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def do_HEAD(self):
+        self.respond(False)
+
+    def do_GET(self):
+        self.respond(True)
+
+
+class LinkCheckerTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), LinkHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        LinkHandler.requests = []
+        LinkHandler.connections = []
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.checker = link_opener.LinkChecker(timeout=2, workers=4, cache_file=os.path.join(directory.name, "history.db"))
+
+    def get_refused_url(self):
+        """Return a URL on a port nothing is listening on."""
+        with socket.socket() as unused:
+            unused.bind(("127.0.0.1", 0))
+            port = unused.getsockname()[1]
+        return f"http://127.0.0.1:{port}/"
+
+    def test_statuses(self):
+        refused = self.get_refused_url()
+        results = self.checker.check([self.base + "/ok", self.base + "/gone", self.base + "/no-head", self.base + "/redirect", refused])
+        self.assertEqual(results[self.base + "/ok"], (200, None))
+        self.assertEqual(results[self.base + "/gone"], (404, None))
+        self.assertEqual(results[self.base + "/no-head"], (200, None))
+        self.assertEqual(results[self.base + "/redirect"], (301, "/ok"))
+        self.assertEqual(results[refused][0], 0)
+        self.assertIsInstance(results[refused][1], str)
+
+    def test_get_after_head_not_allowed(self):
+        self.checker.check([self.base + "/no-head"])
+        self.assertEqual(LinkHandler.requests, [("HEAD", "/no-head"), ("GET", "/no-head")])
+
+    def test_dead_links(self):
+        refused = self.get_refused_url()
+        link_list = [[self.base + "/ok", ""], [self.base + "/gone", ""], [self.base + "/redirect", ""], [refused, ""]]
+        remaining, dead_links = link_opener.check_links(link_list, self.checker)
+        self.assertEqual(remaining, [[self.base + "/ok", ""], [self.base + "/redirect", ""]])
+        self.assertEqual([url for url, status, detail in dead_links], [self.base + "/gone", refused])
+        self.assertEqual(remaining.dead, 2)
+        flagged, dead_links = link_opener.check_links(link_list, self.checker, drop=False)
+        self.assertEqual(flagged, link_list)
+        self.assertEqual(flagged.flagged, 2)
+
+    def test_results_are_cached(self):
+        self.checker.check([self.base + "/ok", self.base + "/gone"])
+        LinkHandler.requests = []
+        results = self.checker.check([self.base + "/ok", self.base + "/gone"])
+        self.assertEqual(LinkHandler.requests, [])
+        self.assertEqual(results[self.base + "/gone"], (404, None))
+
+    def test_non_ascii_url(self):
+        results = self.checker.check([self.base + "/straße?q=café"])
+        self.assertEqual(results[self.base + "/straße?q=café"], (200, None))
+        self.assertEqual(LinkHandler.requests, [("HEAD", "/stra%C3%9Fe?q=caf%C3%A9")])
+
+    def test_connection_is_reused(self):
+        checker = link_opener.LinkChecker(timeout=2, workers=1, cache_file=self.checker.cache_file)
+        results = checker.check([self.base + "/ok", self.base + "/gone", self.base + "/redirect", self.base + "/no-head"])
+        self.assertEqual([status for status, detail in results.values()], [200, 404, 301, 200])
+        self.assertEqual(len(LinkHandler.requests), 5)
+        self.assertEqual(len(LinkHandler.connections), 1)
+
+    def test_links_without_http_scheme(self):
+        results = self.checker.check(["mailto:someone@example.com", "ftp://example.com/file"])
+        self.assertEqual(results, {"mailto:someone@example.com": (None, None), "ftp://example.com/file": (None, None)})
+
+
+if __name__ == "__main__":
+    unittest.main()